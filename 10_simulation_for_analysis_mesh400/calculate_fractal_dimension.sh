@@ -1,8 +1,9 @@
 #!/bin/bash
 
-for f in simulation*_0000.cells; do
-    BASE=`basename -s _0000.cells $f`
-    LASTFILE=`ls ${BASE}*.cells | tail -n 1`
-    REALBASE=`basename -s .cells $LASTFILE`
-    ../fractal_dimension.py ${REALBASE}
+# last state of every simulation, all of them counted in one call
+LASTFILES=""
+for f in simulation*_0000.npz; do
+    BASE=`basename -s _0000.npz $f`
+    LASTFILES="${LASTFILES} `ls ${BASE}_*.npz | tail -n 1`"
 done
+../fractal_dimension.py -j `nproc` ${LASTFILES}
@@ -1,6 +1,6 @@
 #!/bin/bash
 
-for f in simulation*_0000.cells; do
-    BASE=`basename -s _0000.cells $f`
+for f in simulation*_0000.npz; do
+    BASE=`basename -s _0000.npz $f`
     ../analyse.py -i $BASE -o plot_$BASE
 done
@@ -1,3 +1,3 @@
 #!/bin/bash
 
-parallel -j 7 < simulation_commands.list
+../sweep.py sweep.json -j 7
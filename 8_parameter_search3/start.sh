@@ -1,3 +1,3 @@
 #!/bin/bash
 
-parallel -j 7 < parameter_search_commands.list
\ No newline at end of file
+../sweep.py sweep.json -j 7
@@ -1,10 +1,8 @@
 #!/bin/bash
 
+# 800x800 pixels at 2.5 frames per second, rendered by every CPU
 for d in `ls -d */`; do
     cd $d
-    ../../analyse.py -i simulation -o plot_simulation
-    sleep 1
-    convert -delay 40 -loop 0 -coalesce -scale 800x800 -fuzz 2% +dither plot_simulation_*.png movie_simulation.gif
-    sleep 1
+    ../../analyse.py -i simulation -m movie_simulation.gif -j `nproc` --dpi 50 --fps 2.5
     cd ..
-done
\ No newline at end of file
+done
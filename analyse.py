@@ -9,103 +9,225 @@ Authors:
     - Lenard Szantho <lenard@drenal.eu>
 
 Version:
+    - 0.2 (2026-10-18) Figures reused per process, parallel rendering, animations
     - 0.1 (2020-11-04)
 """
 
 import os
-import glob
 import argparse
 import matplotlib.pyplot as plt
-import matplotlib as mpl
+import matplotlib.animation as animation
 import numpy as np
 
-from cell import Cell
+import frames
+from diffusion import process_pool
+
+class Renderer:
+    """Renderer class
+
+    Owns one figure with its image, colorbar and scatter artists, and
+    draws a frame by updating their data in place instead of creating
+    a new figure for every frame.
+
+    Returns:
+        Renderer: instance of a Renderer
+    """
+
+    def __init__(self, discrete=False, dpi=None):
+        self.discrete = discrete
+
+        self.fig, self.ax = plt.subplots(figsize=(16, 16), dpi=dpi)
+        self.im = None
+
+        self.dots = {
+            "dormant": self.ax.scatter(x=[], y=[], label="Cells (dormant)", color="black"),
+            "refactory": self.ax.scatter(x=[], y=[], label="Cells (refactory)", color="blue"),
+            "active": self.ax.scatter(x=[], y=[], label="Cells (active)", color="red"),
+        }
+
+        self.ax.set_xlabel("x", fontsize=16)
+        self.ax.set_ylabel("y", fontsize=16)
+        self.title = self.ax.set_title("", fontsize=16)
+
+    def draw(self, step, c, x, y, state, c_threshold):
+        """Update the figure to show a frame
+
+        Args:
+            step (int): step of the simulation
+            c (numpy 2D array of floats): cAMP concentration matrix
+            x (numpy array of ints): x-coordinates of the cells
+            y (numpy array of ints): y-coordinates of the cells
+            state (numpy array of ints): states of the cells
+            c_threshold (float): threshold concentration of the cells
+        """
+        if self.discrete:
+            image = (c.T > c_threshold) * 1
+        else:
+            image = c.T
+
+        if self.im is None:
+            if self.discrete:
+                self.im = self.ax.imshow(image, interpolation='none', cmap=plt.get_cmap("gray"), zorder=0)
+            else:
+                self.im = self.ax.imshow(image, interpolation='none', zorder=0)
+
+            cb = self.fig.colorbar(self.im)
+            cb.set_label("cAMP", fontsize=16)
+            self.ax.legend(loc=1)
+            self.fig.tight_layout()
+        else:
+            self.im.set_data(image)
+            self.im.set_clim(np.min(image), np.max(image))
 
-def plot(step, c, cells, output, discrete=False):
-    fig, ax = plt.subplots(figsize=(16, 16))
-    
-    if discrete:
-        c_threshold = cells[0].threshold_concentration
-        # define the colors
-        #cmap = mpl.colors.ListedColormap(['w', 'g'])
+        active = state == 1
+        refactory = state == 2
+        dormant = ~(active | refactory)
 
-        # create a normalize object the describes the limits of
-        # each color
-        #if np.max(c) < c_threshold:
-        #    bounds = [0., 1.0, 1.0]
-        #else:
-        #    bounds = [0., c_threshold / np.max(c), 1.0]
-        #norm = mpl.colors.BoundaryNorm(bounds, cmap.N)
+        self.dots["dormant"].set_offsets(np.column_stack([x[dormant], y[dormant]]))
+        self.dots["refactory"].set_offsets(np.column_stack([x[refactory], y[refactory]]))
+        self.dots["active"].set_offsets(np.column_stack([x[active], y[active]]))
 
-        #im = ax.imshow(c.T, interpolation='none', label="cAMP", cmap=cmap, norm=norm)
+        self.title.set_text("Simulation at step {}".format(step))
+
+    def drawframe(self, frame):
+        """Update the figure to show a frames.Frame"""
+        self.draw(frame.step, frame.camp, frame.x, frame.y, frame.state, frame.threshold_concentration)
+
+    def save(self, output, step):
+        self.fig.savefig("{}_{:04d}.png".format(output, step))
+
+    def rgba(self):
+        """Render the figure into an image
+
+        Returns:
+            numpy 3D array of uint8s: RGBA pixels of the figure
+        """
+        self.fig.canvas.draw()
+        return np.array(self.fig.canvas.buffer_rgba())
+
+    def close(self):
+        plt.close(self.fig)
+
+
+def plot(step, c, x, y, state, c_threshold, output, discrete=False):
+    renderer = Renderer(discrete)
+    renderer.draw(step, c, x, y, state, c_threshold)
+    renderer.save(output, step)
+    renderer.close()
+
+
+# renderer of a worker process, reused for every frame it draws
+_renderer = None
 
-        cut_c = (c.T > c_threshold) * 1
-        im = ax.imshow(cut_c, interpolation='none', cmap=plt.cm.get_cmap("gray"))
-    else:
-        im = ax.imshow(c.T, interpolation='none')
-
-    cb = fig.colorbar(im)
-    cb.set_label("cAMP", fontsize=16)    
-
-    cell_dots_x = {"active": [], "dormant": [], "refactory": []}
-    cell_dots_y = {"active": [], "dormant": [], "refactory": []}
-    for cell in cells:
-        x, y = cell.position
-        if cell.state == 1:
-            cell_dots_x["active"].append(x)
-            cell_dots_y["active"].append(y)
-        elif cell.state == 2:
-            cell_dots_x["refactory"].append(x)
-            cell_dots_y["refactory"].append(y)
-        else:
-            cell_dots_x["dormant"].append(x)
-            cell_dots_y["dormant"].append(y)
 
+def _pool(jobs, discrete, dpi):
+    return process_pool(jobs, initializer=_init_worker, initargs=(discrete, dpi))
 
-    ax.scatter(x=cell_dots_x["dormant"], y=cell_dots_y["dormant"], label="Cells (dormant)", color="black")
-    ax.scatter(x=cell_dots_x["refactory"], y=cell_dots_y["refactory"], label="Cells (refactory)", color="blue")
-    ax.scatter(x=cell_dots_x["active"], y=cell_dots_y["active"], label="Cells (active)", color="red")
-    
-    ax.set_xlabel("x", fontsize=16)
-    ax.set_ylabel("y", fontsize=16)
-    ax.set_title("Simulation at step {}".format(step), fontsize=16)
 
-    ax.legend(loc=1)
-    fig.tight_layout()
-    plt.savefig("{}_{:04d}.png".format(output, step))
+def _init_worker(discrete, dpi):
+    global _renderer
+    _renderer = Renderer(discrete, dpi)
 
-    plt.close(fig)
+
+def _save_frame(frame, output):
+    _renderer.drawframe(frame)
+    _renderer.save(output, frame.step)
+
+
+def _render_frame(frame):
+    _renderer.drawframe(frame)
+    return _renderer.rgba()
+
+
+def save_frames(frame_list, output, discrete=False, jobs=1, dpi=None):
+    """Plot every frame into output_[step].png
+
+    Args:
+        frame_list (list of frames.Frame): frames to plot
+        output (string): output plots base path
+        discrete (bool): plot the concentration above the threshold only
+        jobs (int): number of worker processes
+        dpi (float): resolution of the images, matplotlib's default if None
+    """
+    if jobs > 1:
+        with _pool(jobs, discrete, dpi) as pool:
+            pool.starmap(_save_frame, [(frame, output) for frame in frame_list], chunksize=1)
+    else:
+        _init_worker(discrete, dpi)
+        for frame in frame_list:
+            _save_frame(frame, output)
+        _renderer.close()
+
+
+def save_movie(frame_list, movie, discrete=False, jobs=1, dpi=None, fps=2.5):
+    """Stream every frame into an animation
+
+    The writer is chosen by the extension of the movie: GIF files are
+    written with Pillow, anything else with ffmpeg. With more than one
+    job the frames are rendered by worker processes and only collected,
+    in order, by this process.
+
+    Args:
+        frame_list (list of frames.Frame): frames of the animation
+        movie (string): path of the animation
+        discrete (bool): plot the concentration above the threshold only
+        jobs (int): number of worker processes
+        dpi (float): resolution of the frames, matplotlib's default if None
+        fps (float): frames per second
+    """
+    if movie.endswith(".gif"):
+        writer = animation.PillowWriter(fps=fps)
+    else:
+        writer = animation.FFMpegWriter(fps=fps)
+
+    if jobs <= 1:
+        renderer = Renderer(discrete, dpi)
+        with writer.saving(renderer.fig, movie, renderer.fig.dpi):
+            for frame in frame_list:
+                renderer.drawframe(frame)
+                writer.grab_frame()
+        renderer.close()
+        return
+
+    with _pool(jobs, discrete, dpi) as pool:
+        images = pool.imap(_render_frame, frame_list)
+
+        # a figure showing the images rendered by the workers pixel by pixel
+        image = next(images, None)
+        if image is None:
+            return
+        dpi = dpi or plt.rcParams["figure.dpi"]
+        fig = plt.figure(figsize=(image.shape[1] / dpi, image.shape[0] / dpi), dpi=dpi)
+        shown = fig.figimage(image)
+
+        with writer.saving(fig, movie, dpi):
+            writer.grab_frame()
+            for image in images:
+                shown.set_data(image)
+                writer.grab_frame()
+        plt.close(fig)
 
 
 def main():
     parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
-    parser.add_argument('-i', '--input', help="Input state files base")
+    parser.add_argument('-i', '--input', help="Input state files base or .traj file")
     parser.add_argument('-o', '--output', help="Output plots base path")
     parser.add_argument('-d', '--discrete', help="Mode of plot, default: continuous, if set, then discrete", action="store_true")
+    parser.add_argument('-j', '--jobs', help="Number of processes rendering the frames", default=1, type=int)
+    parser.add_argument('-m', '--movie', help="Write the frames into this animation (.gif or ffmpeg format) instead of "
+                        "png files")
+    parser.add_argument('--fps', help="Frames per second of the animation", default=2.5, type=float)
+    parser.add_argument('--dpi', help="Resolution of the frames", type=float)
     args = parser.parse_args()
 
-    
-    # prefix_[step].[cells|camp|playground]
-    cells_files = glob.glob("{}_*.cells".format(args.input))
-    cells_files = sorted(cells_files, key=lambda x: int(x.split('_')[-1].split('.')[0]))
-    camp_files = glob.glob("{}_*.camp".format(args.input))
-    camp_files = sorted(camp_files, key=lambda x: int(x.split('_')[-1].split('.')[0]))
-
-    for i, _ in enumerate(cells_files):
-        step = int(cells_files[i].split('_')[-1].split('.')[0])
-
-        if os.path.isfile("{}_{:04d}.png".format(args.output, step)):
-            continue
+    frame_list = frames.find(args.input)
 
-        cells = []
-        with open(cells_files[i]) as cellsfh:
-            for line in cellsfh:
-                cell = Cell.fromstring(line)
-                cells.append(cell)
-
-        camp = np.loadtxt(camp_files[i])
-
-        plot(step, camp, cells, args.output, args.discrete)
+    if args.movie:
+        save_movie(frame_list, args.movie, args.discrete, args.jobs, args.dpi, args.fps)
+    else:
+        frame_list = [frame for frame in frame_list
+                      if not os.path.isfile("{}_{:04d}.png".format(args.output, frame.step))]
+        save_frames(frame_list, args.output, args.discrete, args.jobs, args.dpi)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Benchmark of the Dictyostelium simulation
+
+Runs the Playground for a fixed number of steps on every combination
+of the mesh sizes, densities and lattice sizes, and records the wall
+time, the throughput, the share of the phases of the steps and the
+peak resident memory of each case. Every case runs in a new process,
+one after the other, so the peak memory is the one of the case and
+the cases don't compete for the CPUs.
+
+The results are written into a JSON file. The scaling exponent of the
+time of a step with the number of lattice sites is fitted for every
+density and lattice size. Given the results of an earlier run as
+baseline, the cases that became slower than the tolerance are listed
+as regressions and the script exits with an error.
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18) Initial implementation
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import itertools
+import tempfile
+
+import numpy as np
+
+from diffusion import BACKENDS, process_pool
+
+
+MESHES = [50, 100, 200, 400, 800]
+RHOS = [0.05, 0.2, 0.5]
+LATTICES = [1., 0.5]
+
+# parameters identifying a case, a baseline is matched on them
+KEYS = ["mesh", "rho", "lattice", "steps", "backend"]
+
+
+def cases(meshes, rhos, lattices, steps, backend):
+    """List the cases of a benchmark
+
+    Returns:
+        list of dict: values of KEYS, ordered by lattice, rho and mesh
+    """
+    return [{"mesh": mesh, "rho": rho, "lattice": lattice, "steps": steps, "backend": backend}
+            for lattice, rho, mesh in itertools.product(lattices, rhos, meshes)]
+
+
+def peak_rss():
+    """Peak resident memory of this process in MiB"""
+    import resource
+
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return usage / 1024**2 if sys.platform == "darwin" else usage / 1024
+
+
+def measure(case):
+    """Run one case of the benchmark
+
+    Args:
+        case (dict): values of KEYS
+
+    Returns:
+        dict: the case and its measurements
+    """
+    from playground import Playground
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        pg = Playground(os.path.join(directory, "benchmark"), lattice_size=case["lattice"], gamma=0.5, rho=case["rho"],
+                        meshsize_x=case["mesh"], meshsize_y=case["mesh"], backend=case["backend"], seed=1, timing=True)
+        setup = time.perf_counter() - start
+
+        # only the first two states are exported
+        pg.startSimulation(max_steps=case["steps"], sampling=case["steps"] + 1)
+
+    summary = pg.timing.summary()
+    result = dict(case)
+    result.update({
+        "sites": int(np.prod(pg.shape)),
+        "cells": len(pg.cells),
+        "setup_seconds": setup,
+        "seconds": summary["seconds"],
+        "steps_per_second": summary["steps_per_second"],
+        "cell_updates_per_second": summary["cell_updates_per_second"],
+        "peak_rss_mb": peak_rss(),
+        "phases": {name: phase["share"] for name, phase in summary["phases"].items()},
+    })
+
+    return result
+
+
+def run(case_list):
+    """Run the cases, each in a new process
+
+    Args:
+        case_list (list of dict): cases to run
+
+    Returns:
+        list of dict: results in the order of the cases
+    """
+    # a new process per case
+    results = []
+    with process_pool(1, maxtasksperchild=1) as pool:
+        for case in case_list:
+            result = pool.apply(measure, (case,))
+            print("mesh {mesh:4} rho {rho:4} lattice {lattice:4}: {steps_per_second:9.1f} steps/s "
+                  "{cell_updates_per_second:9.3g} cell updates/s {peak_rss_mb:7.1f} MiB".format(**result))
+            results.append(result)
+
+    return results
+
+
+def exponents(results):
+    """Fit the scaling of the time of a step with the number of sites
+
+    Args:
+        results (list of dict): results of the cases
+
+    Returns:
+        dict: exponent of the fit seconds/step ~ sites^exponent by (rho, lattice),
+            for the series with at least two mesh sizes
+    """
+    series = {}
+    for result in results:
+        series.setdefault((result["rho"], result["lattice"]), []).append(result)
+
+    fits = {}
+    for key, points in sorted(series.items()):
+        if len(points) < 2:
+            continue
+        sites = np.log([point["sites"] for point in points])
+        step_seconds = np.log([1. / point["steps_per_second"] for point in points])
+        fits[key] = float(np.polyfit(sites, step_seconds, 1)[0])
+
+    return fits
+
+
+def compare(results, baseline, tolerance=0.1):
+    """Find the cases slower than in a baseline
+
+    Args:
+        results (list of dict): results of the cases
+        baseline (list of dict): results of an earlier run, cases missing from it are skipped
+        tolerance (float): allowed relative loss of steps per second
+
+    Returns:
+        list of tuples: result, baseline result and relative change of the steps per second of each regression
+    """
+    earlier = {tuple(result[key] for key in KEYS): result for result in baseline}
+
+    regressions = []
+    for result in results:
+        reference = earlier.get(tuple(result[key] for key in KEYS))
+        if reference is None:
+            continue
+
+        change = result["steps_per_second"] / reference["steps_per_second"] - 1.
+        if change < -tolerance:
+            regressions.append((result, reference, change))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-m', '--mesh', help="Mesh sizes", nargs='+', default=MESHES, type=int)
+    parser.add_argument('-r', '--rho', help="Densities of cells", nargs='+', default=RHOS, type=float)
+    parser.add_argument('-a', '--lattice', help="Lattice sizes", nargs='+', default=LATTICES, type=float)
+    parser.add_argument('-s', '--steps', help="Steps to run each case for", default=100, type=int)
+    parser.add_argument('-b', '--backend', help="Diffusion solver", default="numpy", choices=sorted(BACKENDS))
+    parser.add_argument('-o', '--output', help="JSON file of the results", default="benchmark.json")
+    parser.add_argument('--baseline', help="JSON file of earlier results to compare with")
+    parser.add_argument('--tolerance', help="Allowed relative loss of steps per second against the baseline",
+                        default=0.1, type=float)
+    args = parser.parse_args()
+
+    results = run(cases(args.mesh, args.rho, args.lattice, args.steps, args.backend))
+
+    with open(args.output, "w") as outputfh:
+        json.dump({"python": platform.python_version(), "numpy": np.__version__, "cpus": os.cpu_count(),
+                   "results": results}, outputfh, indent=4)
+
+    for (rho, lattice), exponent in exponents(results).items():
+        print("rho {} lattice {}: seconds per step ~ sites^{:.2f}".format(rho, lattice, exponent))
+
+    if args.baseline:
+        with open(args.baseline, "r") as baselinefh:
+            baseline = json.load(baselinefh)["results"]
+
+        regressions = compare(results, baseline, args.tolerance)
+        for result, reference, change in regressions:
+            print("WARNING: mesh {} rho {} lattice {} is {:.0%} slower: {:.1f} steps/s, was {:.1f}".format(
+                result["mesh"], result["rho"], result["lattice"], -change, result["steps_per_second"],
+                reference["steps_per_second"]))
+        if regressions:
+            raise SystemExit("{} regressions".format(len(regressions)))
+
+
+if __name__ == "__main__":
+    main()
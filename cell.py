@@ -19,6 +19,7 @@ Authors:
     - Lenard Szantho <lenard@drenal.eu>
 
 Version:
+    - 0.4 (2026-10-18) Parameters are stored per instance in CellParameters
     - 0.3 (2020-11-07) New logic based on Kessler and Levine (1993) paper
     - 0.2 (2020-11-05) Bugfixes
     - 0.1 (2020-11-02) Initial implmenetation
@@ -26,6 +27,8 @@ Version:
 
 import numpy as np
 
+from parameters import CellParameters, parameter
+
 class Cell:
     """Cell class
 
@@ -42,28 +45,24 @@ class Cell:
     Returns:
         Cell: instance of a Cell
     """
-    # $c_T$
-    threshold_concentration = 20
-    # $\delta c$
-    delta_concentration = 6000
-    # $\tau$
-    tau = 2
-    # $t_R$
-    recovery_time = 20
-    # lattice size / cell size factor
-    lattice_size_factor = 1
+    # parameters shared by the cells of a simulation, see CellParameters
+    threshold_concentration = parameter("threshold_concentration")
+    delta_concentration = parameter("delta_concentration")
+    tau = parameter("tau")
+    recovery_time = parameter("recovery_time")
+    lattice_size_factor = parameter("lattice_size_factor")
 
     def __init__(self, id, threshold_concentration = 20,
                  delta_concentration = 6000, tau = 2,
                  recovery_time=20, lattice_size_factor=1.,
                  state=0., source=0., current_time=0.,
-                 x=0, y=0, cancer=False, multiplier=1, moved=False):
-        # shared by all Cell objects
-        Cell.threshold_concentration = float(threshold_concentration)
-        Cell.delta_concentration = float(delta_concentration)
-        Cell.tau = float(tau)
-        Cell.recovery_time = float(recovery_time)
-        Cell.lattice_size_factor = int(float(lattice_size_factor))
+                 x=0, y=0, cancer=False, multiplier=1, moved=False,
+                 parameters=None):
+        # shared with the other cells if given
+        if parameters is None:
+            parameters = CellParameters(threshold_concentration, delta_concentration, tau,
+                                        recovery_time, lattice_size_factor)
+        self.parameters = parameters
 
         # unique 
         self.id = int(float(id))
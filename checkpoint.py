@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Binary checkpoints of the simulation
+
+A checkpoint is a single compressed numpy archive (base_path.npz)
+holding the cAMP concentration, the cells as a structured array and
+the parameters of the playground and the cells as metadata. It
+replaces the base_path.{camp,cells,playground} text files, which can
+still be read and converted with this script.
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18) Initial implementation
+"""
+
+import os
+import glob
+import json
+import argparse
+
+import numpy as np
+
+from cell import Cell
+from population import CELL_DTYPE, Population
+
+
+# parameters shared by every cell, keyword arguments of Population
+CELL_PARAMETERS = ["threshold_concentration", "delta_concentration", "tau",
+                   "recovery_time", "lattice_size_factor"]
+
+FORMATS = ["npz", "text"]
+
+# extensions of the files a checkpoint consists of
+EXTENSIONS = [".npz", ".camp", ".cells", ".playground"]
+
+
+class Snapshot:
+    """Snapshot class
+
+    The state of a simulation at one step, as read from or written
+    into a checkpoint.
+
+    Returns:
+        Snapshot: instance of a Snapshot
+    """
+
+    def __init__(self, playground, camp, cells, cell_parameters):
+        # string representation of the Playground, input of Playground.fromstring
+        self.playground = playground
+        # cAMP concentration matrix
+        self.camp = camp
+        # structured array of CELL_DTYPE
+        self.cells = cells
+        # dict of CELL_PARAMETERS
+        self.cell_parameters = cell_parameters
+
+    @classmethod
+    def frompopulation(cls, playground, camp, population, replica=None):
+        """Take a snapshot, copying the concentration and the cells
+
+        Args:
+            playground (string): string representation of the Playground
+            camp (numpy 2D array of floats): cAMP concentration matrix
+            population (Population): cells of the simulation
+            replica (int): take only the cells of this replica of a batched population
+
+        Returns:
+            Snapshot: a copy of the state, unaffected by later steps
+        """
+        return cls(playground, camp.copy(), population.torecords(replica), population.parameters.asdict())
+
+
+def basepath(path):
+    """Strip the extension of a checkpoint file from path
+
+    Args:
+        path (string): path of a checkpoint file or base path of a checkpoint
+
+    Returns:
+        string: base path of the checkpoint
+    """
+    base_path, extension = os.path.splitext(path)
+    if extension in EXTENSIONS:
+        return base_path
+
+    return path
+
+
+def find(prefix):
+    """Find the checkpoints written by a simulation
+
+    Checkpoints are named prefix_[step], a step stored in both
+    formats is only listed once.
+
+    Args:
+        prefix (string): output base of the simulation
+
+    Returns:
+        list of (int, string) tuples: steps and base paths, ordered by step
+    """
+    base_paths = set()
+    for extension in [".npz", ".cells"]:
+        for path in glob.glob("{}_*{}".format(prefix, extension)):
+            base_paths.add(basepath(path))
+
+    checkpoints = []
+    for base_path in base_paths:
+        step = base_path.split('_')[-1]
+        if step.isdigit():
+            checkpoints.append((int(step), base_path))
+
+    return sorted(checkpoints)
+
+
+def exists(base_path):
+    """Tell whether there is a checkpoint in any format at base path
+
+    Args:
+        base_path (string): path of the checkpoint without extension
+
+    Returns:
+        bool: True if a binary or text checkpoint exists
+    """
+    return os.path.isfile("{}.npz".format(base_path)) or os.path.isfile("{}.playground".format(base_path))
+
+
+def save(base_path, snapshot, precision="float64"):
+    """Write a binary checkpoint
+
+    Args:
+        base_path (string): path of the checkpoint without extension
+        snapshot (Snapshot): state to write
+        precision (string): float type to store the concentration with
+    """
+    np.savez_compressed("{}.npz".format(base_path),
+                        camp=snapshot.camp.astype(precision, copy=False),
+                        cells=snapshot.cells,
+                        playground=np.array(snapshot.playground),
+                        cell_parameters=np.array(json.dumps(snapshot.cell_parameters)))
+
+
+def save_text(base_path, snapshot):
+    """Write a checkpoint into base_path.{camp,cells,playground} text files
+
+    Args:
+        base_path (string): path of the checkpoint without extension
+        snapshot (Snapshot): state to write
+    """
+    population = Population.fromrecords(snapshot.cells, **snapshot.cell_parameters)
+    with open("{}.cells".format(base_path), "w") as cellsfh:
+        for cell in population:
+            cellsfh.write("{}\n".format(cell))
+
+    with open("{}.playground".format(base_path), "w") as pgfh:
+        pgfh.write("{}\n".format(snapshot.playground))
+
+    np.savetxt("{}.camp".format(base_path), snapshot.camp)
+
+
+def write(base_path, snapshot, snapshot_format="npz", precision="float64"):
+    """Write a checkpoint in the given format
+
+    Args:
+        base_path (string): path of the checkpoint without extension
+        snapshot (Snapshot): state to write
+        snapshot_format (string): one of FORMATS
+        precision (string): float type to store the concentration with in binary format
+    """
+    if snapshot_format == "npz":
+        save(base_path, snapshot, precision)
+    elif snapshot_format == "text":
+        save_text(base_path, snapshot)
+    else:
+        raise ValueError("unknown checkpoint format: {}".format(snapshot_format))
+
+
+def load(base_path):
+    """Read a checkpoint, binary if it exists, text otherwise
+
+    Args:
+        base_path (string): path of the checkpoint without extension
+
+    Returns:
+        Snapshot: the state stored in the checkpoint
+    """
+    if os.path.isfile("{}.npz".format(base_path)):
+        with np.load("{}.npz".format(base_path)) as archive:
+            return Snapshot(str(archive["playground"]), archive["camp"], archive["cells"],
+                            json.loads(str(archive["cell_parameters"])))
+
+    return load_text(base_path)
+
+
+def load_text(base_path):
+    """Read a checkpoint from the base_path.{camp,cells,playground} text files
+
+    Args:
+        base_path (string): path of the checkpoint without extension
+
+    Returns:
+        Snapshot: the state stored in the checkpoint
+    """
+    with open("{}.playground".format(base_path), "r") as pgfh:
+        playground = pgfh.readline().strip()
+
+    cells = []
+    with open("{}.cells".format(base_path), "r") as cellsfh:
+        for line in cellsfh:
+            cells.append(Cell.fromstring(line))
+
+    records = np.zeros(len(cells), dtype=CELL_DTYPE)
+    for i, cell in enumerate(cells):
+        records[i] = tuple(getattr(cell, name) for name in CELL_DTYPE.names)
+
+    if len(cells) > 0:
+        cell_parameters = {name: getattr(cells[0], name) for name in CELL_PARAMETERS}
+    else:
+        cell_parameters = {}
+
+    camp = np.loadtxt("{}.camp".format(base_path))
+
+    return Snapshot(playground, camp, records, cell_parameters)
+
+
+def convert(base_path, precision="float64", remove=False):
+    """Convert a text checkpoint into a binary one
+
+    Args:
+        base_path (string): path of the checkpoint without extension
+        precision (string): float type to store the concentration with
+        remove (bool): delete the text files after the conversion
+    """
+    save(base_path, load_text(base_path), precision)
+
+    if remove:
+        for extension in ["camp", "cells", "playground"]:
+            os.remove("{}.{}".format(base_path, extension))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', nargs='+', help="Base paths of the text checkpoints (or any of their files)")
+    parser.add_argument('-p', '--precision', help="Float type of the stored concentration", default="float64",
+                        choices=["float32", "float64"])
+    parser.add_argument('--remove', help="Delete the text files after conversion", action="store_true")
+    args = parser.parse_args()
+
+    for path in args.input:
+        convert(basepath(path), args.precision, args.remove)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,11 @@ Version:
 
 import argparse
 
+import checkpoint
+import observables
+from diffusion import BACKENDS
 from playground import Playground
+from trajectory import Trajectory
 
 
 def main():
@@ -28,22 +32,84 @@ def main():
     parser.add_argument('-R', '--recovery', help="Timespan of a cell being resistant to excitation", default=20, type=float)
     parser.add_argument('-m', '--mesh', help="1D size of the 2D mesh to simulate on (it's always a square mesh)", default=10, type=float)
     parser.add_argument('-s', '--steps', help="Steps to run PDE for", default=100, type=int, required=True)
-    parser.add_argument('-i', '--import', help="Import state from base path's files", dest="importstate")
+    parser.add_argument('-i', '--import', help="Import state from base path's files (binary or text) or from a .traj file",
+                        dest="importstate")
+    parser.add_argument('--import-step', help="Step to import from a .traj file (default: last one)", type=int)
     parser.add_argument('-o', '--output', help="Output plots' base", required=True)
-    parser.add_argument('-S', '--sampling', help="Number of steps to sample after", default=10, type=int)
+    parser.add_argument('-S', '--sampling', help="Number of steps to sample after (default: 10, the one of the "
+                        "restart file if resumed)", type=int)
+    parser.add_argument('-b', '--backend', help="Diffusion solver (numba falls back to numpy if not installed)",
+                        default="numpy", choices=sorted(BACKENDS))
+    parser.add_argument('--dt', help="Timestep of the diffusion (default: stable timestep of the explicit scheme), "
+                        "larger ones need an implicit backend", type=float)
+    parser.add_argument('--substeps', help="Cell updates per timestep (default: as many as explicit timesteps fit "
+                        "into the timestep)", type=int)
+    parser.add_argument('--tolerance', help="Concentration up to which the sparse backend skips a quiescent region "
+                        "(default: 1e-6, 0 gives the same result as the numpy backend)", type=float)
+    parser.add_argument('-w', '--workers', help="Number of threads of the numba and tiled backends (default: number of CPUs)",
+                        type=int)
+    parser.add_argument('-f', '--format', help="Format of the exported states, traj appends every state to output.traj",
+                        default="npz", choices=checkpoint.FORMATS + ["traj"])
+    parser.add_argument('-p', '--precision', help="Float type of the exported cAMP concentration (npz format only)",
+                        default="float64", choices=["float32", "float64"])
+    parser.add_argument('-q', '--export-queue', help="Write exported states in the background, keeping at most this many "
+                        "waiting (default: 0, synchronous export)", default=0, type=int)
+    parser.add_argument('-n', '--replicas', help="Number of independent simulations run side by side, their outputs "
+                        "are numbered: output01, output02, ...", default=1, type=int)
+    parser.add_argument('--seed', help="Seed of the random placement of the cells, replica r is seeded with seed + r "
+                        "(default: random)", type=int)
+    parser.add_argument('--restart-every', help="Steps between the restart files written into output.restart.npz "
+                        "(default: 0, none)", default=0, type=int)
+    parser.add_argument('--resume', help="Continue the simulation of a restart file up to --steps, with the same "
+                        "timestep, substeps, tolerance, replicas and seed")
+    parser.add_argument('--timing', help="Measure the time spent in each phase of the steps and report it at the end",
+                        action="store_true")
+    parser.add_argument('--heartbeat', help="Steps between the timing reports printed during the simulation "
+                        "(default: 0, none)", default=0, type=int)
+    parser.add_argument('--timing-json', help="Write the timing report into this JSON file at the end")
+    parser.add_argument('--observables', help="Append the counts of the cell states, the mean and maximum cAMP, the "
+                        "box counts and the number of clusters at every sample to output.observables.tsv",
+                        action="store_true")
+    parser.add_argument('--no-snapshots', help="Don't export the full states at the samples", dest="snapshots",
+                        action="store_false")
+    parser.add_argument('--debug', help="Check the consistency of the cell positions and sources in every step", action="store_true")
     args = parser.parse_args()
 
-    if args.importstate:
-        pg = Playground.fromstring(open("{}.playground".format(args.importstate), "r").readline())
+    if args.importstate and args.replicas > 1:
+        parser.error("a state can only be imported into a single simulation")
+    if args.resume and args.importstate:
+        parser.error("a simulation is either resumed or started from an imported state")
+
+    options = {"backend": args.backend, "workers": args.workers, "debug": args.debug, "snapshot_format": args.format,
+               "precision": args.precision, "export_queue": args.export_queue, "restart_every": args.restart_every,
+               "timing": args.timing or args.timing_json is not None, "heartbeat": args.heartbeat,
+               "observables": observables.default() if args.observables else None, "snapshots": args.snapshots}
+    # options stored in the restart files
+    dynamics = {"dt": args.dt, "substeps": args.substeps, "tolerance": args.tolerance}
+
+    if args.resume:
+        pg = Playground.fromrestart(args.resume, **options)
         pg.output = args.output
-        pg.importCells(args.importstate)
-        pg.importCAMP(args.importstate)
+    elif args.importstate:
+        if args.importstate.endswith(".traj"):
+            states = Trajectory(args.importstate)
+            snapshot = states[-1] if args.import_step is None else states.at(args.import_step)
+        else:
+            snapshot = checkpoint.load(checkpoint.basepath(args.importstate))
+        pg = Playground.fromstring(snapshot.playground, **dynamics, **options)
+        pg.output = args.output
+        pg.importSnapshot(snapshot)
     else:
         pg = Playground(args.output, args.threshold, args.camp, args.tau, args.recovery, args.lattice,
-                        args.gamma, args.rho, args.mesh, args.mesh)
+                        args.gamma, args.rho, args.mesh, args.mesh, replicas=args.replicas, seed=args.seed, **dynamics, **options)
 
     pg.startSimulation(max_steps = args.steps, sampling = args.sampling)
 
+    if pg.timing.enabled:
+        print(pg.timing.report())
+    if args.timing_json:
+        pg.timing.save(args.timing_json)
+
     
 if __name__ == "__main__":
     main()
@@ -0,0 +1,720 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Diffusion solvers for the cAMP layer
+
+Every solver advances the cAMP concentration by one timestep
+of the reaction-diffusion equation used by the Playground:
+
+    c = c0 + dt * (a^2 * laplace(c0) - gamma * c0 + sources * dt)
+
+on a periodic mesh, and clips the result at zero. Grids of independent
+replicas can be stacked along a leading axis, each is advanced on its
+own in the same call.
+
+The explicit solvers are stable up to twice the timestep the Playground
+uses by default. The implicit and spectral solvers are stable at any
+timestep, they
+solve the equation the explicit scheme discretizes,
+
+    dc/dt = a^2 * laplace(c) - gamma * c + sources * source_dt
+
+where source_dt is the timestep of the explicit scheme, so the amount
+of released cAMP doesn't depend on the timestep.
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.7 (2026-10-18) Sparse solver updating the active blocks only
+    - 0.6 (2026-10-18) Spectral solver
+    - 0.5 (2026-10-18) Unconditionally stable ADI solver
+    - 0.4 (2026-10-18) Multithreaded solver on strips of the grid
+    - 0.3 (2026-10-18) Stacked grids of replicas
+    - 0.2 (2026-10-18) Optional fused numba backend
+    - 0.1 (2026-10-18) Initial implementation
+"""
+
+import os
+import abc
+import functools
+import multiprocessing
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def process_pool(processes, **kwargs):
+    """Pool of worker processes that can be started from a process running threads
+
+    A forked worker inherits the locks held by the threads of its parent
+    (numba, the tiled solver, the background writer) without the
+    threads releasing them, and can deadlock. The workers are spawned
+    instead.
+
+    Args:
+        processes (int): number of worker processes
+        kwargs: keyword arguments of multiprocessing.Pool
+
+    Returns:
+        multiprocessing.pool.Pool: the pool
+    """
+    return multiprocessing.get_context("spawn").Pool(processes, **kwargs)
+
+
+class Solver(abc.ABC):
+    """Solver class
+
+    Parameters of the equation shared by the diffusion solvers.
+
+    Returns:
+        Solver: instance of a Solver
+    """
+
+    # concentration up to which a region counts as quiescent for the sparse solvers
+    TOLERANCE = 0.
+
+    def __init__(self, shape, dt, lattice_size, dx2, dy2, gamma, workers=None, source_dt=None, tolerance=None):
+        self.shape = tuple(shape)
+        self.dt = float(dt)
+        self.lattice_size = float(lattice_size)
+        self.dx2 = float(dx2)
+        self.dy2 = float(dy2)
+        self.gamma = float(gamma)
+        # number of threads of the parallel solvers, number of CPUs if None
+        self.workers = workers
+        # the sources are released at a rate of sources * source_dt
+        self.source_dt = self.dt if source_dt is None else float(source_dt)
+        self.tolerance = self.TOLERANCE if tolerance is None else float(tolerance)
+
+    def reset(self):
+        """Forget what the solver knows about the concentrations, they were changed outside of step"""
+
+    def close(self):
+        """Release the resources of the solver, the next step acquires them again"""
+
+    @abc.abstractmethod
+    def step(self, c0, c, sources):
+        """Advance the concentration by one timestep
+
+        Args:
+            c0 (numpy 2D or stacked 3D array of floats): concentration at the beginning of the step
+            c (numpy 2D or stacked 3D array of floats): output array, must not be c0
+            sources (numpy 2D or stacked 3D array of floats): cAMP released by the cells
+        """
+
+
+class FiniteDifference(Solver):
+    """Explicit finite difference solver
+
+    Computes the periodic 5-point Laplacian with slices into
+    preallocated scratch arrays, so a timestep does not allocate
+    any new grid.
+
+    Returns:
+        FiniteDifference: instance of the solver
+    """
+
+    def __init__(self, shape, dt, lattice_size, dx2, dy2, gamma, workers=None, source_dt=None, tolerance=None):
+        # single threaded, workers is ignored
+        super().__init__(shape, dt, lattice_size, dx2, dy2, gamma, workers, source_dt, tolerance)
+
+        self.twice = np.empty(self.shape)
+        self.scratch = np.empty(self.shape)
+
+    def step(self, c0, c, sources):
+        """Advance the concentration by one timestep
+
+        Args:
+            c0 (numpy 2D or stacked 3D array of floats): concentration at the beginning of the step
+            c (numpy 2D or stacked 3D array of floats): output array, must not be c0
+            sources (numpy 2D or stacked 3D array of floats): cAMP released by the cells
+        """
+        twice = self.twice
+        scratch = self.scratch
+
+        np.multiply(c0, 2, out=twice)
+
+        # neighbours along the columns, value from the right minus twice the center plus value from the left
+        np.subtract(c0[..., 1:], twice[..., :-1], out=c[..., :-1])
+        np.subtract(c0[..., :1], twice[..., -1:], out=c[..., -1:])
+        c[..., 1:] += c0[..., :-1]
+        c[..., :1] += c0[..., -1:]
+        c /= self.dx2
+
+        # neighbours along the rows, value from above minus twice the center plus value from below
+        np.subtract(c0[..., :-1, :], twice[..., 1:, :], out=scratch[..., 1:, :])
+        np.subtract(c0[..., -1:, :], twice[..., :1, :], out=scratch[..., :1, :])
+        scratch[..., :-1, :] += c0[..., 1:, :]
+        scratch[..., -1:, :] += c0[..., :1, :]
+        scratch /= self.dy2
+
+        c += scratch
+        c *= self.lattice_size * self.lattice_size
+
+        np.multiply(c0, self.gamma, out=scratch)
+        c -= scratch
+        np.multiply(sources, self.source_dt, out=scratch)
+        c += scratch
+
+        c *= self.dt
+        c += c0
+
+        # concentration is strictly positive number
+        np.clip(c, 0, None, c)
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _fused_step(c0, c, sources, dt, lattice_size, dx2, dy2, gamma, source_dt):
+        # grids are stacked along the first axis, the rows of every grid are processed in parallel
+        replicas, nx, ny = c0.shape
+        for k in numba.prange(replicas * nx):
+            r = k // nx
+            i = k - r * nx
+            above = i - 1 if i > 0 else nx - 1
+            below = i + 1 if i < nx - 1 else 0
+            for j in range(ny):
+                left = j - 1 if j > 0 else ny - 1
+                right = j + 1 if j < ny - 1 else 0
+
+                center = c0[r, i, j]
+                twice = center * 2
+                laplace_x = (c0[r, i, right] - twice + c0[r, i, left]) / dx2
+                laplace_y = (c0[r, above, j] - twice + c0[r, below, j]) / dy2
+
+                value = center + dt * ((lattice_size * lattice_size) * (laplace_x + laplace_y)
+                                       - gamma * center + sources[r, i, j] * source_dt)
+                # concentration is strictly positive number
+                c[r, i, j] = value if value > 0. else 0.
+
+
+class NumbaFiniteDifference(FiniteDifference):
+    """Explicit finite difference solver compiled with numba
+
+    Same scheme as FiniteDifference, but the Laplacian, the decay,
+    the sources and the clipping are fused into a single pass over
+    the grid, which is parallelized over the rows.
+
+    Returns:
+        NumbaFiniteDifference: instance of the solver
+    """
+
+    def __init__(self, shape, dt, lattice_size, dx2, dy2, gamma, workers=None, source_dt=None, tolerance=None):
+        if numba is None:
+            raise ImportError("numba is required by the numba backend")
+
+        # the fused kernel needs no scratch arrays
+        Solver.__init__(self, shape, dt, lattice_size, dx2, dy2, gamma, workers, source_dt, tolerance)
+
+    def step(self, c0, c, sources):
+        """Advance the concentration by one timestep
+
+        Args:
+            c0 (numpy 2D or stacked 3D array of floats): concentration at the beginning of the step
+            c (numpy 2D or stacked 3D array of floats): output array, must not be c0
+            sources (numpy 2D or stacked 3D array of floats): cAMP released by the cells
+        """
+        if self.workers is not None:
+            numba.set_num_threads(min(self.workers, numba.config.NUMBA_NUM_THREADS))
+        if c0.ndim == 2:
+            c0, c, sources = c0[np.newaxis], c[np.newaxis], sources[np.newaxis]
+        _fused_step(c0, c, sources, self.dt, self.lattice_size, self.dx2, self.dy2, self.gamma, self.source_dt)
+
+
+class TiledFiniteDifference(FiniteDifference):
+    """Explicit finite difference solver on strips of the grid
+
+    The grid is split into strips of rows, which are updated in
+    parallel by a pool of threads, numpy releases the GIL while it
+    processes the arrays. Every strip is computed with the same
+    operations as FiniteDifference does, so the result is identical.
+    The strips share the grid, a strip reads the row above and the row
+    below it (its halo) directly from the neighbouring strips, which
+    are not written before every strip has finished the step.
+
+    Returns:
+        TiledFiniteDifference: instance of the solver
+    """
+
+    def __init__(self, shape, dt, lattice_size, dx2, dy2, gamma, workers=None, source_dt=None, tolerance=None):
+        Solver.__init__(self, shape, dt, lattice_size, dx2, dy2, gamma, workers, source_dt, tolerance)
+
+        nx = self.shape[-2]
+        self.workers = max(1, min(int(workers or os.cpu_count() or 1), nx))
+
+        # first and last row of each strip and its own scratch arrays
+        bounds = np.linspace(0, nx, self.workers + 1).astype(int)
+        self.strips = []
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            strip_shape = self.shape[:-2] + (last - first, self.shape[-1])
+            self.strips.append((first, last, np.empty(strip_shape), np.empty(strip_shape)))
+
+        # pool of threads updating the strips, started by the first step after a close
+        self.pool = None
+
+    def close(self):
+        """Stop the threads of the solver, the next step starts them again"""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __step_strip(self, c0, c, sources, first, last, twice, scratch):
+        nx = c0.shape[-2]
+        center = c0[..., first:last, :]
+        out = c[..., first:last, :]
+
+        np.multiply(center, 2, out=twice)
+
+        # neighbours along the columns, value from the right minus twice the center plus value from the left
+        np.subtract(center[..., 1:], twice[..., :-1], out=out[..., :-1])
+        np.subtract(center[..., :1], twice[..., -1:], out=out[..., -1:])
+        out[..., 1:] += center[..., :-1]
+        out[..., :1] += center[..., -1:]
+        out /= self.dx2
+
+        # neighbours along the rows, the first and the last row use the halo rows of the neighbouring strips
+        above = (first - 1) % nx
+        below = last % nx
+        np.subtract(center[..., :-1, :], twice[..., 1:, :], out=scratch[..., 1:, :])
+        np.subtract(c0[..., above:above + 1, :], twice[..., :1, :], out=scratch[..., :1, :])
+        scratch[..., :-1, :] += center[..., 1:, :]
+        scratch[..., -1:, :] += c0[..., below:below + 1, :]
+        scratch /= self.dy2
+
+        out += scratch
+        out *= self.lattice_size * self.lattice_size
+
+        np.multiply(center, self.gamma, out=scratch)
+        out -= scratch
+        np.multiply(sources[..., first:last, :], self.source_dt, out=scratch)
+        out += scratch
+
+        out *= self.dt
+        out += center
+
+        # concentration is strictly positive number
+        np.clip(out, 0, None, out)
+
+    def step(self, c0, c, sources):
+        """Advance the concentration by one timestep
+
+        Args:
+            c0 (numpy 2D or stacked 3D array of floats): concentration at the beginning of the step
+            c (numpy 2D or stacked 3D array of floats): output array, must not be c0
+            sources (numpy 2D or stacked 3D array of floats): cAMP released by the cells
+        """
+        if len(self.strips) == 1:
+            self.__step_strip(c0, c, sources, *self.strips[0])
+            return
+
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="diffusion")
+
+        futures = [self.pool.submit(self.__step_strip, c0, c, sources, *strip) for strip in self.strips]
+        # every strip has to be finished before the next step reads its rows
+        for future in futures:
+            future.result()
+
+
+class SparseFiniteDifference(FiniteDifference):
+    """Explicit finite difference solver of the active regions
+
+    The grid is divided into square blocks, a block is active if its
+    concentration is above the tolerance or it has a source. Only the
+    active blocks and their neighbours are updated, the rest of the
+    grid is set to zero, so the region updated grows with the waves.
+    The updated blocks are gathered with their halo into a stack and
+    computed with the same operations as FiniteDifference, so with a
+    tolerance of 0 the result is identical, otherwise concentrations
+    up to the tolerance are dropped in the quiescent regions. As the
+    explicit scheme spreads the concentration by a site every step,
+    hardly anything is skipped with a tolerance of 0.
+
+    The concentration of a block is known from the step that computed
+    it, so the grid is only scanned if the solver is given another
+    array than its last output. Both arrays have to be C-contiguous.
+
+    Returns:
+        SparseFiniteDifference: instance of the solver
+    """
+
+    # size of the blocks in sites
+    BLOCK = 16
+    # far below the threshold concentration of the cells, the waves leave a tail that never reaches 0
+    TOLERANCE = 1e-6
+
+    def __init__(self, shape, dt, lattice_size, dx2, dy2, gamma, workers=None, source_dt=None, tolerance=None,
+                 block=None):
+        # single threaded, workers is ignored
+        Solver.__init__(self, shape, dt, lattice_size, dx2, dy2, gamma, workers, source_dt, tolerance)
+
+        block = self.BLOCK if block is None else int(block)
+        # first site of the blocks of each axis and the sites of the blocks with and without the halo,
+        # the last block is moved back to fit into the grid, so it may overlap the previous one
+        self.starts = []
+        self.sites = []
+        self.halos = []
+        for n in self.shape[-2:]:
+            size = min(block, n)
+            starts = np.arange(0, n, size)
+            self.starts.append(starts)
+            first = np.minimum(starts, n - size)
+            self.sites.append(first[:, np.newaxis] + np.arange(size))
+            self.halos.append((first[:, np.newaxis] + np.arange(-1, size + 1)) % n)
+
+        self.strides = np.array(np.empty(self.shape).strides) // np.dtype(np.float64).itemsize
+
+        # the last output and its active blocks
+        self.output = None
+        self.active = None
+        # the last buffers written and their blocks that may hold non-zero concentrations
+        self.written = []
+
+    def reset(self):
+        """Forget what the solver knows about the concentrations, they were changed outside of step"""
+        self.output = None
+        self.active = None
+        self.written = []
+
+    def __blocks(self, values):
+        """Maximum of the values in each block"""
+        # the rows of the full blocks are reduced as a reshaped view, it's much faster than reduceat
+        size = self.sites[0].shape[1]
+        full = values.shape[-2] // size * size
+        rows = values[..., :full, :].reshape(values.shape[:-2] + (full // size, size, values.shape[-1])).max(axis=-2)
+        if full < values.shape[-2]:
+            rows = np.concatenate([rows, values[..., full:, :].max(axis=-2, keepdims=True)], axis=-2)
+        return np.maximum.reduceat(rows, self.starts[1], axis=-1)
+
+    def __index(self, blocks, rows, columns):
+        """Flat indices of the given sites of the blocks
+
+        Args:
+            blocks (tuple of numpy arrays of ints): indices of the blocks, as returned by numpy.nonzero
+            rows (numpy 2D array of ints): sites of every block along the rows
+            columns (numpy 2D array of ints): sites of every block along the columns
+
+        Returns:
+            numpy 3D array of ints: flat indices, one matrix per block
+        """
+        index = (rows[blocks[-2]] * self.strides[-2])[:, :, np.newaxis] \
+            + (columns[blocks[-1]] * self.strides[-1])[:, np.newaxis, :]
+        if len(blocks) == 3:
+            index += (blocks[0] * self.strides[0])[:, np.newaxis, np.newaxis]
+        return index
+
+    def step(self, c0, c, sources):
+        """Advance the concentration by one timestep
+
+        Args:
+            c0 (numpy 2D or stacked 3D array of floats): concentration at the beginning of the step
+            c (numpy 2D or stacked 3D array of floats): output array, must not be c0
+            sources (numpy 2D or stacked 3D array of floats): cAMP released by the cells
+        """
+        if not (c0.flags.c_contiguous and c.flags.c_contiguous):
+            raise ValueError("the sparse solver needs C-contiguous concentrations")
+
+        # blocks with concentration or sources and their neighbours
+        if c0 is not self.output:
+            self.active = self.__blocks(c0) > self.tolerance
+        active = self.active | (self.__blocks(sources) > 0.)
+        update = active.copy()
+        for axis in [-2, -1]:
+            update |= np.roll(active, 1, axis=axis)
+            update |= np.roll(active, -1, axis=axis)
+
+        # blocks computed into the buffer before that are quiescent now
+        written = next((blocks for buffer, blocks in self.written if buffer is c), None)
+        flat = c.reshape(-1)
+        quiescent = np.nonzero(~update if written is None else written & ~update)
+        flat[self.__index(quiescent, self.sites[0], self.sites[1])] = 0.
+
+        blocks = np.nonzero(update)
+        padded = c0.reshape(-1)[self.__index(blocks, self.halos[0], self.halos[1])]
+        interior = self.__index(blocks, self.sites[0], self.sites[1])
+
+        center = padded[:, 1:-1, 1:-1]
+        twice = np.multiply(center, 2)
+
+        # neighbours along the columns, value from the right minus twice the center plus value from the left
+        out = np.subtract(padded[:, 1:-1, 2:], twice)
+        out += padded[:, 1:-1, :-2]
+        out /= self.dx2
+
+        # neighbours along the rows, value from above minus twice the center plus value from below
+        scratch = np.subtract(padded[:, :-2, 1:-1], twice)
+        scratch += padded[:, 2:, 1:-1]
+        scratch /= self.dy2
+
+        out += scratch
+        out *= self.lattice_size * self.lattice_size
+
+        np.multiply(center, self.gamma, out=scratch)
+        out -= scratch
+        np.multiply(sources.reshape(-1)[interior], self.source_dt, out=scratch)
+        out += scratch
+
+        out *= self.dt
+        out += center
+
+        # concentration is strictly positive number
+        np.clip(out, 0, None, out)
+        flat[interior] = out
+
+        # the active blocks of the output are known without scanning it
+        self.active = np.zeros_like(update)
+        self.active[blocks] = out.max(axis=(1, 2)) > self.tolerance
+        self.output = c
+        # the buffers are swapped, the last two are kept
+        self.written = [(buffer, blocks) for buffer, blocks in self.written if buffer is not c][-1:] + [(c, update)]
+
+
+class CyclicTridiagonal:
+    """Solver of periodic tridiagonal systems with constant coefficients
+
+    The matrix has the given diagonal, the off-diagonal value next to
+    it and in the corners. The system is solved with the Thomas
+    algorithm and the Sherman-Morrison correction of the corners, the
+    factors of the elimination are computed once.
+
+    Returns:
+        CyclicTridiagonal: instance of the solver
+    """
+
+    def __init__(self, n, diagonal, off):
+        if n < 3:
+            raise ValueError("periodic systems need at least 3 unknowns, not {}".format(n))
+
+        self.n = n
+        self.off = off
+
+        # A = B + u v^T, B is tridiagonal, u = (g, 0, ..., 0, off), v = (1, 0, ..., 0, off / g)
+        self.g = -diagonal
+        main = np.full(n, float(diagonal))
+        main[0] -= self.g
+        main[-1] -= off * off / self.g
+
+        # forward elimination of B: multipliers of the next unknown and inverse pivots
+        self.upper = np.empty(n)
+        self.pivot = np.empty(n)
+        self.pivot[0] = 1. / main[0]
+        self.upper[0] = off * self.pivot[0]
+        for i in range(1, n):
+            self.pivot[i] = 1. / (main[i] - off * self.upper[i - 1])
+            self.upper[i] = off * self.pivot[i]
+
+        u = np.zeros(n)
+        u[0] = self.g
+        u[-1] = off
+        self.z = self.__thomas(u)
+        self.denominator = 1. + self.z[0] + off / self.g * self.z[-1]
+
+    def __thomas(self, d):
+        """Solve B x = d in place along the first axis"""
+        d[0] *= self.pivot[0]
+        for i in range(1, self.n):
+            d[i] -= self.off * d[i - 1]
+            d[i] *= self.pivot[i]
+        for i in range(self.n - 2, -1, -1):
+            d[i] -= self.upper[i] * d[i + 1]
+        return d
+
+    def solve(self, d):
+        """Solve A x = d in place along the first axis
+
+        Args:
+            d (numpy array of floats): right hand side, the other axes are independent systems
+
+        Returns:
+            numpy array of floats: d, overwritten by the solution
+        """
+        y = self.__thomas(d)
+        factor = (y[0] + self.off / self.g * y[-1]) / self.denominator
+        y -= np.multiply.outer(self.z, factor)
+        return y
+
+
+class AlternatingDirectionImplicit(Solver):
+    """Peaceman-Rachford alternating direction implicit solver
+
+    Every timestep is split into two halves, the first one is implicit
+    along the columns and explicit along the rows, the second one the
+    other way round, the decay is shared equally. Both halves solve
+    periodic tridiagonal systems, the scheme is second order accurate
+    and unconditionally stable.
+
+    Returns:
+        AlternatingDirectionImplicit: instance of the solver
+    """
+
+    def __init__(self, shape, dt, lattice_size, dx2, dy2, gamma, workers=None, source_dt=None, tolerance=None):
+        super().__init__(shape, dt, lattice_size, dx2, dy2, gamma, workers, source_dt, tolerance)
+
+        half = 0.5 * self.dt
+        # diffusion coefficients along the columns (last axis) and the rows
+        self.k = {-1: self.lattice_size * self.lattice_size / self.dx2,
+                  -2: self.lattice_size * self.lattice_size / self.dy2}
+        # (I - dt/2 (k D - gamma/2)) along each axis
+        self.systems = {axis: CyclicTridiagonal(self.shape[axis], 1. + half * (2. * k + 0.5 * self.gamma), -half * k)
+                        for axis, k in self.k.items()}
+
+        self.half = np.empty(self.shape)
+        self.scratch = np.empty(self.shape)
+
+    def __explicit(self, c0, axis, out):
+        """out = c0 + dt/2 (k D - gamma/2) c0 along the axis"""
+        np.add(np.roll(c0, 1, axis=axis), np.roll(c0, -1, axis=axis), out=out)
+        out -= 2. * c0
+        out *= 0.5 * self.dt * self.k[axis]
+        out += (1. - 0.25 * self.dt * self.gamma) * c0
+
+    def __implicit(self, rhs, axis, out):
+        """Solve (I - dt/2 (k D - gamma/2)) out = rhs along the axis"""
+        work = np.ascontiguousarray(np.moveaxis(rhs, axis, 0))
+        np.moveaxis(out, axis, 0)[...] = self.systems[axis].solve(work)
+
+    def step(self, c0, c, sources):
+        """Advance the concentration by one timestep
+
+        Args:
+            c0 (numpy 2D or stacked 3D array of floats): concentration at the beginning of the step
+            c (numpy 2D or stacked 3D array of floats): output array, must not be c0
+            sources (numpy 2D or stacked 3D array of floats): cAMP released by the cells
+        """
+        forcing = self.scratch
+        np.multiply(sources, 0.5 * self.dt * self.source_dt, out=forcing)
+
+        # implicit along the columns
+        self.__explicit(c0, -2, self.half)
+        self.half += forcing
+        self.__implicit(self.half, -1, self.half)
+
+        # implicit along the rows
+        self.__explicit(self.half, -1, c)
+        c += forcing
+        self.__implicit(c, -2, c)
+
+        # concentration is strictly positive number
+        np.clip(c, 0, None, c)
+
+
+@functools.lru_cache(maxsize=16)
+def propagator(shape, dt, lattice_size, dx2, dy2, gamma):
+    """Factors advancing the Fourier modes of the concentration by one timestep
+
+    The modes of the periodic 5-point Laplacian are the eigenvectors of
+    the discretized equation, each evolves on its own:
+
+        c_k(t + dt) = exp(lambda_k dt) c_k(t) + (exp(lambda_k dt) - 1) / lambda_k f_k
+
+    where lambda_k is the eigenvalue of a^2 * laplace - gamma and f_k is
+    the constant forcing. The factors are cached, as they only depend on
+    the arguments.
+
+    Args:
+        shape (tuple of ints): size of the grid, rows and columns
+        dt (float): timestep
+
+    Returns:
+        tuple of numpy 2D arrays of floats: decay and forcing factors of the modes of numpy.fft.rfft2
+    """
+    rows, columns = shape
+    # eigenvalues of the 1D periodic second difference: -4 sin^2(pi k / n)
+    along_rows = -4. * np.sin(np.pi * np.fft.fftfreq(rows))**2 / dy2
+    along_columns = -4. * np.sin(np.pi * np.fft.rfftfreq(columns))**2 / dx2
+    rate = lattice_size * lattice_size * np.add.outer(along_rows, along_columns) - gamma
+
+    decay = np.exp(rate * dt)
+    forcing = np.full(rate.shape, dt)
+    # the uniform mode does not change without decay
+    nonzero = rate != 0.
+    forcing[nonzero] = np.expm1(rate[nonzero] * dt) / rate[nonzero]
+
+    decay.flags.writeable = False
+    forcing.flags.writeable = False
+    return decay, forcing
+
+
+class Spectral(Solver):
+    """Spectral solver
+
+    Advances every Fourier mode of the concentration exactly, the
+    sources are a constant forcing during the timestep. The result is
+    the exact solution of the equation the finite difference scheme
+    discretizes in space, a timestep costs two FFTs of the grid at any
+    timestep.
+
+    Returns:
+        Spectral: instance of the solver
+    """
+
+    def __init__(self, shape, dt, lattice_size, dx2, dy2, gamma, workers=None, source_dt=None, tolerance=None):
+        # numpy.fft is single threaded, workers is ignored
+        super().__init__(shape, dt, lattice_size, dx2, dy2, gamma, workers, source_dt, tolerance)
+
+        self.decay, self.forcing = propagator(self.shape[-2:], self.dt, self.lattice_size, self.dx2, self.dy2,
+                                              self.gamma)
+        # the forcing is the released cAMP times source_dt
+        self.forcing = self.forcing * self.source_dt
+
+    def step(self, c0, c, sources):
+        """Advance the concentration by one timestep
+
+        Args:
+            c0 (numpy 2D or stacked 3D array of floats): concentration at the beginning of the step
+            c (numpy 2D or stacked 3D array of floats): output array, must not be c0
+            sources (numpy 2D or stacked 3D array of floats): cAMP released by the cells
+        """
+        modes = np.fft.rfft2(c0)
+        modes *= self.decay
+        released = np.fft.rfft2(sources)
+        released *= self.forcing
+        modes += released
+        c[...] = np.fft.irfft2(modes, s=self.shape[-2:])
+
+        # concentration is strictly positive number, rounding errors may be slightly negative
+        np.clip(c, 0, None, c)
+
+
+# available solvers by the name used on the command line
+BACKENDS = {
+    "numpy": FiniteDifference,
+    "numba": NumbaFiniteDifference,
+    "tiled": TiledFiniteDifference,
+    "adi": AlternatingDirectionImplicit,
+    "spectral": Spectral,
+    "sparse": SparseFiniteDifference,
+}
+
+# backends stable at any timestep
+IMPLICIT_BACKENDS = {"adi", "spectral"}
+
+
+def make_solver(backend, shape, dt, lattice_size, dx2, dy2, gamma, workers=None, source_dt=None, tolerance=None):
+    """Create the diffusion solver of the given backend
+
+    Falls back to the numpy solver if the backend's dependency is missing.
+
+    Args:
+        backend (string): name of the backend, key of BACKENDS
+        workers (int): number of threads of the parallel backends, number of CPUs if None
+        source_dt (float): timestep the sources are scaled with, dt if None
+        tolerance (float): concentration of the quiescent regions skipped by the sparse backend, its default if None
+
+    Returns:
+        FiniteDifference: the solver
+    """
+    try:
+        return BACKENDS[backend](shape, dt, lattice_size, dx2, dy2, gamma, workers, source_dt, tolerance)
+    except ImportError as error:
+        print("WARNING: {}, falling back to the numpy backend".format(error))
+        return FiniteDifference(shape, dt, lattice_size, dx2, dy2, gamma, workers, source_dt, tolerance)
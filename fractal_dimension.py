@@ -6,33 +6,198 @@
 This script calculates the fractal dimension
 from the outputted state files of a simulation
 
+The boxes occupied by the cells are counted at every scale in one
+pass over the integer cell coordinates, binned exactly as
+np.histogramdd bins them with the edges np.arange(0, meshsize, scale).
+More simulations (e.g. replicas) are processed in one call, in
+parallel with --jobs, and with --evolution the dimension of every
+exported state is written into a table, as the dimension over time.
+
 Authors:
     - Lenard Szantho <lenard@drenal.eu>
 
 Version:
+    - 0.3 (2026-10-18) Box counting at every scale in one pass, more inputs in parallel, dimension over time
+    - 0.2 (2026-10-18) Box counting is reused by the observables of the simulation
     - 0.1 (2020-11-08)
 """
 import argparse
+import functools
 
 import numpy as np
 import matplotlib.pyplot as plt
 
-from cell import Cell
-from playground import Playground
+import checkpoint
+import frames
+from diffusion import process_pool
 
-def plot(cells, meshsize_x, meshsize_y,  output):
 
-    cell_coords = []
-    for cell in cells:
-        cell_coords.append(cell.position)
-    cell_coords = np.array(cell_coords)
+# sizes of the boxes counted
+SCALES = np.logspace(0.01, 1, num=10, endpoint=False, base=2)
+
+
+@functools.lru_cache(maxsize=16)
+def _boxes(meshsize, scales, extent):
+    """Box of every integer coordinate along one axis at each scale
+
+    The boxes are the bins of np.histogramdd with the edges
+    np.arange(0, meshsize, scale), the last one is closed on the right.
+    For integer scales this is the integer division by the scale, up
+    to the last edge.
+
+    Args:
+        meshsize (int): size of the mesh along the axis
+        scales (tuple of floats): sizes of the boxes
+        extent (int): number of coordinates, from 0
+
+    Returns:
+        tuple: numpy 2D array of the box of each coordinate at each scale, -1 outside
+            of the boxes, and numpy array of the number of boxes at each scale
+    """
+    coordinates = np.arange(extent)
+    boxes = np.empty((len(scales), extent), dtype=np.intp)
+    sizes = np.empty(len(scales), dtype=np.intp)
+
+    for i, scale in enumerate(scales):
+        edges = np.arange(0, meshsize, scale)
+        box = np.searchsorted(edges, coordinates, side="right") - 1
+        box[coordinates == edges[-1]] -= 1
+        box[box >= len(edges) - 1] = -1
+
+        boxes[i] = box
+        sizes[i] = len(edges) - 1
+
+    return boxes, sizes
+
+
+@functools.lru_cache(maxsize=16)
+def _numbering(meshsize_x, meshsize_y, scales, extent_x, extent_y):
+    """Number of the box of every coordinate, the boxes of every scale numbered one after the other
+
+    The number of the box of (x, y) is numbers_x[:, x] + numbers_y[:, y],
+    it is negative if the coordinates are outside of the boxes.
+
+    Returns:
+        tuple: numpy 2D arrays numbers_x and numbers_y, one row per scale, and the
+            offsets of the numbers of each scale, one more than scales
+    """
+    boxes_x, sizes_x = _boxes(meshsize_x, scales, extent_x)
+    boxes_y, sizes_y = _boxes(meshsize_y, scales, extent_y)
+    offsets = np.concatenate([[0], np.cumsum(sizes_x * sizes_y)])
+
+    numbers_x = offsets[:-1, np.newaxis] + boxes_x * sizes_y[:, np.newaxis]
+    numbers_y = boxes_y.copy()
+    # low enough to make the sum negative with any number of the other axis
+    numbers_x[boxes_x < 0] = -offsets[-1] - 1
+    numbers_y[boxes_y < 0] = -offsets[-1] - 1
+
+    return numbers_x, numbers_y, offsets
+
+
+class BoxCounter:
+    """BoxCounter class
+
+    Counts the boxes occupied by cells at every scale at once.
+
+    Returns:
+        BoxCounter: instance of a BoxCounter
+    """
+
+    def __init__(self, meshsize_x, meshsize_y, scales=SCALES):
+        self.meshsize_x = int(meshsize_x)
+        self.meshsize_y = int(meshsize_y)
+        self.scales = tuple(float(scale) for scale in scales)
+
+    def count(self, cell_coords):
+        """Count the boxes of each size occupied by cells
+
+        Args:
+            cell_coords (numpy 2D array of ints): x- and y-coordinates of the cells, one row per cell
+
+        Returns:
+            numpy array of ints: number of boxes holding at least one cell, for each size
+        """
+        cell_coords = np.asarray(cell_coords).reshape(-1, 2)
+        coords = cell_coords.astype(np.intp)
+        if not np.array_equal(coords, cell_coords) or np.any(coords < 0):
+            raise ValueError("boxes can only be counted for non-negative integer coordinates")
+        x, y = coords.T
+
+        numbers_x, numbers_y, offsets = _numbering(self.meshsize_x, self.meshsize_y, self.scales,
+                                                   max(self.meshsize_x, int(x.max(initial=0)) + 1),
+                                                   max(self.meshsize_y, int(y.max(initial=0)) + 1))
+
+        numbers = numbers_x[:, x] + numbers_y[:, y]
+
+        occupied = np.zeros(offsets[-1], dtype=bool)
+        occupied[numbers[numbers >= 0]] = True
+
+        return np.array([np.count_nonzero(occupied[start:stop]) for start, stop in zip(offsets[:-1], offsets[1:])],
+                        dtype=np.intp)
+
+
+def box_counts(cell_coords, meshsize_x, meshsize_y, scales=SCALES):
+    """Count the boxes of each size occupied by cells
+
+    Args:
+        cell_coords (numpy 2D array of ints): x- and y-coordinates of the cells, one row per cell
+        meshsize_x (int): size of the mesh along x
+        meshsize_y (int): size of the mesh along y
+        scales (list of floats): sizes of the boxes
+
+    Returns:
+        list of ints: number of boxes holding at least one cell, for each size
+    """
+    return BoxCounter(meshsize_x, meshsize_y, scales).count(cell_coords).tolist()
 
-    scales=np.logspace(0.01, 1, num=10, endpoint=False, base=2)
-    Ns = []
-    
-    for scale in scales:
-        H, edges=np.histogramdd(cell_coords, bins=(np.arange(0,meshsize_x,scale),np.arange(0,meshsize_y,scale)))
-        Ns.append(np.sum(H>0))
+
+def _frame_counts(frame, scales):
+    meshsize_x, meshsize_y = frame.meshsize
+    return BoxCounter(meshsize_x, meshsize_y, scales).count(np.column_stack([frame.x, frame.y]))
+
+
+def frame_box_counts(frame_list, scales=SCALES, jobs=1):
+    """Count the occupied boxes of many frames
+
+    Args:
+        frame_list (list of frames.Frame): frames of any simulations
+        scales (list of floats): sizes of the boxes
+        jobs (int): number of worker processes
+
+    Returns:
+        numpy 2D array of ints: number of occupied boxes of each size, one row per frame
+    """
+    tasks = [(frame, scales) for frame in frame_list]
+    if jobs > 1 and len(tasks) > 1:
+        with process_pool(jobs) as pool:
+            counts = pool.starmap(_frame_counts, tasks, chunksize=max(1, len(tasks) // (4 * jobs)))
+    else:
+        counts = [_frame_counts(*task) for task in tasks]
+
+    return np.array(counts, dtype=np.intp).reshape(len(tasks), len(scales))
+
+
+def dimension(scales, Ns):
+    """Box-counting dimension, the negative slope of log(number of boxes) against log(box size)
+
+    Args:
+        scales (list of floats): sizes of the boxes
+        Ns (list of ints): number of occupied boxes of each size
+
+    Returns:
+        float: the dimension, nan if there are empty scales
+    """
+    if np.any(np.asarray(Ns) <= 0):
+        return np.nan
+
+    return -np.polyfit(np.log(scales), np.log(Ns), 1)[0]
+
+
+def plot(cell_coords, meshsize_x, meshsize_y,  output, Ns=None):
+
+    scales = SCALES
+    if Ns is None:
+        Ns = box_counts(cell_coords, meshsize_x, meshsize_y, scales)
 
     coeffs = np.polyfit(np.log(scales), np.log(Ns), 1)
 
@@ -52,15 +217,61 @@ def plot(cells, meshsize_x, meshsize_y,  output):
     plt.close(fig)
 
 
+def plot_evolution(steps, dimensions, output):
+    np.savetxt("{}.tsv".format(output), np.column_stack([steps, dimensions]), fmt=["%d", "%.6f"], delimiter="\t",
+               header="step\tdimension", comments="")
+
+    fig, ax = plt.subplots(figsize=(16, 8))
+
+    ax.plot(steps, dimensions, "o-")
+    ax.set_xlabel("step", fontsize=20)
+    ax.set_ylabel("fractal dimension", fontsize=20)
+    ax.set_title("Fractal dimension of {}".format(output.split("_fractal_dim")[0]), fontsize=20)
+    fig.tight_layout()
+    plt.savefig("{}.png".format(output))
+
+    plt.close(fig)
+
+
 def main():
     parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
-    parser.add_argument('input', help="Input state files base")
+    parser.add_argument('input', help="Input state files base or .traj file, output base of the checkpoints "
+                        "with --evolution", nargs='+')
+    parser.add_argument('-s', '--step', help="Step to use from a .traj file (default: last one)", type=int)
+    parser.add_argument('-e', '--evolution', help="Calculate the dimension of every state of the simulations, "
+                        "written into [input]_fractal_dim_evolution.tsv", action="store_true")
+    parser.add_argument('-j', '--jobs', help="Number of worker processes counting the boxes", default=1, type=int)
     args = parser.parse_args()
 
-    pg = Playground.fromstring(open("{}.playground".format(args.input), "r").readline())
-    pg.importCells(args.input)
-    
-    plot(pg.cells, pg.meshsize_x, pg.meshsize_y, args.input+"_fractal_dim")
+    if args.evolution:
+        frame_lists = [frames.find(source) for source in args.input]
+        counts = frame_box_counts([frame for frame_list in frame_lists for frame in frame_list], SCALES, args.jobs)
+
+        start = 0
+        for source, frame_list in zip(args.input, frame_lists):
+            if not frame_list:
+                print("WARNING: no states of {}".format(source))
+                continue
+            Ns = counts[start:start + len(frame_list)]
+            start += len(frame_list)
+
+            output = source[:-len(".traj")] if source.endswith(".traj") else source
+            plot_evolution([frame.step for frame in frame_list], [dimension(SCALES, N) for N in Ns],
+                           output + "_fractal_dim_evolution")
+        return
+
+    frame_list = [frames.load(source, args.step) for source in args.input]
+    counts = frame_box_counts(frame_list, SCALES, args.jobs)
+
+    for source, frame, Ns in zip(args.input, frame_list, counts):
+        meshsize_x, meshsize_y = frame.meshsize
+
+        if source.endswith(".traj"):
+            output = "{}_{:04d}".format(source[:-len(".traj")], frame.step)
+        else:
+            output = checkpoint.basepath(source)
+
+        plot(np.column_stack([frame.x, frame.y]), meshsize_x, meshsize_y, output+"_fractal_dim", Ns)
 
 
 if __name__ == "__main__":
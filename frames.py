@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Lazy frame reader for the analysis scripts
+
+A Frame gives access to the cAMP concentration and to the x, y and
+state columns of the cells of one exported state, without creating
+Cell objects. Nothing is read before it is accessed: frames of a
+trajectory are memory-mapped views, binary checkpoints are read member
+by member and text checkpoints column by column.
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18) Initial implementation
+"""
+
+import os
+import abc
+import functools
+
+import numpy as np
+
+import checkpoint
+from trajectory import Trajectory
+
+
+# names of the values in the string representation of a Playground, in order
+PLAYGROUND_FIELDS = ["output", "cell_threshold_concentration", "cell_delta_concentration", "cell_tau",
+                     "cell_recovery_time", "lattice_size", "gamma", "rho", "meshsize_x", "meshsize_y"]
+
+# columns of the cells in text checkpoints, same order as Cell.__str__
+TEXT_COLUMNS = {"state": 6, "x": 9, "y": 10}
+
+
+class Frame(abc.ABC):
+    """Frame class
+
+    One exported state of a simulation, read lazily.
+
+    Returns:
+        Frame: instance of a Frame
+    """
+
+    def __init__(self, step):
+        self.step = step
+
+    @property
+    @abc.abstractmethod
+    def playground(self):
+        """String representation of the Playground"""
+
+    @property
+    @abc.abstractmethod
+    def camp(self):
+        """cAMP concentration matrix"""
+
+    @property
+    def x(self):
+        """x-coordinates of the cells"""
+        return self.column("x")
+
+    @property
+    def y(self):
+        """y-coordinates of the cells"""
+        return self.column("y")
+
+    @property
+    def state(self):
+        """States of the cells"""
+        return self.column("state")
+
+    @abc.abstractmethod
+    def column(self, name):
+        """One property of every cell
+
+        Args:
+            name (string): field of population.CELL_DTYPE
+
+        Returns:
+            numpy array: the values, ordered by cell id
+        """
+
+    @property
+    def parameters(self):
+        """Parameters of the Playground
+
+        Returns:
+            dict: values by the names in PLAYGROUND_FIELDS, as strings
+        """
+        return dict(zip(PLAYGROUND_FIELDS, self.playground.split()))
+
+    @property
+    def meshsize(self):
+        """Size of the mesh
+
+        Returns:
+            tuple of ints: meshsize_x, meshsize_y
+        """
+        parameters = self.parameters
+        return int(float(parameters["meshsize_x"])), int(float(parameters["meshsize_y"]))
+
+    @property
+    def threshold_concentration(self):
+        """Threshold concentration of the cells"""
+        return float(self.parameters["cell_threshold_concentration"])
+
+
+class TrajectoryFrame(Frame):
+    """Frame of a trajectory file, its arrays are memory-mapped views"""
+
+    def __init__(self, states, i):
+        super().__init__(int(states.frames["step"][i]))
+        self.states = states
+        self.i = i
+
+    def __reduce__(self):
+        # pickled by path, so it can be sent to other processes without the data
+        return trajectory_frame, (self.states.path, self.i)
+
+    @property
+    def playground(self):
+        return self.states.header["playground"]
+
+    @property
+    def camp(self):
+        return self.states.frames["camp"][self.i]
+
+    def column(self, name):
+        return self.states.frames["cells"][name][self.i]
+
+
+class BinaryFrame(Frame):
+    """Frame of a binary checkpoint, members are read on first access"""
+
+    def __init__(self, step, base_path):
+        super().__init__(step)
+        self.path = "{}.npz".format(base_path)
+        self.__cells = None
+
+    def __read(self, key):
+        with np.load(self.path) as archive:
+            return archive[key]
+
+    @property
+    def playground(self):
+        return str(self.__read("playground"))
+
+    @property
+    def camp(self):
+        return self.__read("camp")
+
+    def column(self, name):
+        if self.__cells is None:
+            self.__cells = self.__read("cells")
+        return self.__cells[name]
+
+
+class TextFrame(Frame):
+    """Frame of a text checkpoint, only the requested columns are parsed"""
+
+    def __init__(self, step, base_path):
+        super().__init__(step)
+        self.base_path = base_path
+
+    @property
+    def playground(self):
+        with open("{}.playground".format(self.base_path), "r") as pgfh:
+            return pgfh.readline().strip()
+
+    @property
+    def camp(self):
+        return np.loadtxt("{}.camp".format(self.base_path))
+
+    def column(self, name):
+        values = np.loadtxt("{}.cells".format(self.base_path), usecols=TEXT_COLUMNS[name], ndmin=1)
+        return values.astype(np.int64)
+
+
+@functools.lru_cache(maxsize=4)
+def _trajectory(path):
+    return Trajectory(path)
+
+
+def trajectory_frame(path, i):
+    """Frame of a trajectory file, the file is opened once per process
+
+    Args:
+        path (string): path of the .traj file
+        i (int): position of the frame
+
+    Returns:
+        TrajectoryFrame: the frame
+    """
+    return TrajectoryFrame(_trajectory(path), i)
+
+
+def frame(base_path, step=None):
+    """Frame of a checkpoint
+
+    Args:
+        base_path (string): base path of a checkpoint (or any of its files)
+        step (int): step to report for the frame, parsed from the base path if not given
+
+    Returns:
+        Frame: the frame
+    """
+    base_path = checkpoint.basepath(base_path)
+    if step is None:
+        suffix = base_path.split('_')[-1]
+        step = int(suffix) if suffix.isdigit() else 0
+
+    # same preference as checkpoint.load
+    if os.path.isfile("{}.npz".format(base_path)):
+        return BinaryFrame(step, base_path)
+
+    if checkpoint.exists(base_path):
+        return TextFrame(step, base_path)
+
+    raise FileNotFoundError("no checkpoint at {}".format(base_path))
+
+
+def find(source):
+    """Frames of a simulation
+
+    Args:
+        source (string): path of a .traj file or output base of the checkpoints
+
+    Returns:
+        list of Frame: frames ordered as written in a trajectory, by step otherwise
+    """
+    if source.endswith(".traj"):
+        states = Trajectory(source)
+        return [TrajectoryFrame(states, i) for i in range(len(states))]
+
+    # prefix_[step].npz or prefix_[step].[cells|camp|playground]
+    return [frame(base_path, step) for step, base_path in checkpoint.find(source)]
+
+
+def load(source, step=None):
+    """One frame of a simulation
+
+    Args:
+        source (string): path of a .traj file or base path of a checkpoint
+        step (int): step to select from a trajectory, the last frame if not given
+
+    Returns:
+        Frame: the frame
+    """
+    if source.endswith(".traj"):
+        states = Trajectory(source)
+        if step is None:
+            return TrajectoryFrame(states, len(states) - 1)
+        if step not in states.index:
+            raise KeyError("step {} is not in {}".format(step, source))
+        return TrajectoryFrame(states, states.index[step])
+
+    return frame(source)
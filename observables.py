@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Observables measured during the simulation
+
+Instead of exporting the full state at every sample and reducing it
+afterwards, the Playground can measure a few observables of each
+replica at the samples and append them to a time series, a tab
+separated table with one row per sample in [output].observables.tsv.
+An observable is an object with the names of its columns and a
+measure method computing their values from the concentration and the
+cells, see Observable. The default ones are:
+
+    - StateCounts: number of dormant, active and refactory cells
+    - Concentration: mean and maximum cAMP concentration
+    - BoxCounts: boxes occupied by cells at the scales of fractal_dimension.py
+    - Clusters: number of aggregation clusters and size of the largest one
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18) Initial implementation
+"""
+
+import os
+import abc
+
+import numpy as np
+
+import fractal_dimension
+
+
+class Observable(abc.ABC):
+    """Observable class
+
+    Base of the observables, columns names the values measure returns.
+
+    Returns:
+        Observable: instance of an Observable
+    """
+
+    columns = []
+
+    @abc.abstractmethod
+    def measure(self, c, x, y, state, parameters):
+        """Measure the observable on the state of a replica
+
+        Args:
+            c (numpy 2D array of floats): cAMP concentration matrix
+            x (numpy array of ints): x-coordinates of the cells
+            y (numpy array of ints): y-coordinates of the cells
+            state (numpy array of ints): states of the cells
+            parameters (PlaygroundParameters): parameters of the simulation
+
+        Returns:
+            list: value of each column
+        """
+
+
+class StateCounts(Observable):
+    """Number of cells in each state"""
+
+    columns = ["dormant", "active", "refactory"]
+
+    def measure(self, c, x, y, state, parameters):
+        return np.bincount(state, minlength=3)[:3].tolist()
+
+
+class Concentration(Observable):
+    """Mean and maximum of the cAMP concentration"""
+
+    columns = ["camp_mean", "camp_max"]
+
+    def measure(self, c, x, y, state, parameters):
+        return [float(np.mean(c)), float(np.max(c))]
+
+
+class BoxCounts(Observable):
+    """Number of boxes occupied by cells at each scale, see fractal_dimension.box_counts"""
+
+    def __init__(self, scales=fractal_dimension.SCALES):
+        self.scales = scales
+        self.columns = ["boxes_{:.4g}".format(scale) for scale in scales]
+
+    def measure(self, c, x, y, state, parameters):
+        return fractal_dimension.box_counts(np.column_stack([x, y]), parameters.meshsize_x, parameters.meshsize_y,
+                                            self.scales)
+
+
+class Clusters(Observable):
+    """Number of aggregation clusters and number of cells in the largest cluster
+
+    Cells touch if they are neighbours, i.e. at most a cell size apart
+    along both axes on the periodic mesh. A cluster is a group of
+    touching cells of at least min_size cells.
+    """
+
+    columns = ["clusters", "largest_cluster"]
+
+    def __init__(self, min_size=10):
+        self.min_size = int(min_size)
+
+    def measure(self, c, x, y, state, parameters):
+        if len(x) == 0:
+            return [0, 0]
+
+        sizes = np.bincount(label(x, y, c.shape, parameters.lattice_size_factor))
+        return [int(np.count_nonzero(sizes >= self.min_size)), int(sizes.max())]
+
+
+def label(x, y, shape, reach=1):
+    """Label the groups of touching cells
+
+    Args:
+        x (numpy array of ints): x-coordinates of the cells
+        y (numpy array of ints): y-coordinates of the cells
+        shape (tuple of ints): shape of the periodic mesh
+        reach (int): largest distance along both axes of touching cells
+
+    Returns:
+        numpy array of ints: lowest index of the cells in the group of each cell
+    """
+    labels = np.arange(len(x))
+
+    occupancy = np.full(shape, -1, dtype=np.intp)
+    occupancy[x, y] = labels
+
+    # touching pairs, each found from one of its cells only
+    first, second = [], []
+    for dx in range(reach + 1):
+        for dy in range(-reach, reach + 1):
+            if dx == 0 and dy <= 0:
+                continue
+            neighbour = occupancy[(x + dx) % shape[0], (y + dy) % shape[1]]
+            touching = neighbour >= 0
+            first.append(labels[touching])
+            second.append(neighbour[touching])
+    first = np.concatenate(first)
+    second = np.concatenate(second)
+
+    # union-find on the pairs, the root of a group is its lowest index and every label points to a root
+    while True:
+        roots_first, roots_second = labels[first], labels[second]
+        differ = roots_first != roots_second
+        if not np.any(differ):
+            return labels
+
+        low = np.minimum(roots_first[differ], roots_second[differ])
+        high = np.maximum(roots_first[differ], roots_second[differ])
+        np.minimum.at(labels, high, low)
+
+        while True:
+            compressed = labels[labels]
+            if np.array_equal(compressed, labels):
+                break
+            labels = compressed
+
+
+def default():
+    """Observables measured if the simulation is asked for its observables
+
+    Returns:
+        list of Observable: a new instance of each default observable
+    """
+    return [StateCounts(), Concentration(), BoxCounts(), Clusters()]
+
+
+def path(output):
+    """Path of the time series of a simulation
+
+    Args:
+        output (string): output base of the simulation
+
+    Returns:
+        string: path of the time series
+    """
+    return "{}.observables.tsv".format(output)
+
+
+class TimeSeries:
+    """TimeSeries class
+
+    Appends the observables of the samples to a tab separated table,
+    step in the first column. A simulation resumed after a step keeps
+    the rows up to it and replaces the later ones.
+
+    Returns:
+        TimeSeries: instance of a TimeSeries
+    """
+
+    def __init__(self, series_path, observables, until=None):
+        self.path = series_path
+        self.observables = observables
+        self.columns = ["step"] + [column for observable in observables for column in observable.columns]
+        header = "\t".join(self.columns) + "\n"
+
+        rows = []
+        if until is not None and os.path.isfile(self.path):
+            with open(self.path, "r") as seriesfh:
+                if seriesfh.readline() != header:
+                    raise ValueError("{} has other columns than the observables of the simulation".format(self.path))
+                rows = [row for row in seriesfh if int(row.split("\t", 1)[0]) <= until]
+
+        with open("{}.tmp".format(self.path), "w") as seriesfh:
+            seriesfh.write(header)
+            seriesfh.writelines(rows)
+        os.replace("{}.tmp".format(self.path), self.path)
+
+        self.seriesfh = open(self.path, "a")
+
+    def append(self, step, c, x, y, state, parameters):
+        """Measure the observables and append them as the row of a step
+
+        Args:
+            step (int): step of the simulation
+            c, x, y, state, parameters: state of the replica, see Observable.measure
+        """
+        values = [step]
+        for observable in self.observables:
+            values.extend(observable.measure(c, x, y, state, parameters))
+
+        self.seriesfh.write("\t".join(_format(value) for value in values) + "\n")
+        self.seriesfh.flush()
+
+    def close(self):
+        self.seriesfh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _format(value):
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    return "{:.10g}".format(value)
+
+
+def load(series_path):
+    """Read a time series
+
+    Args:
+        series_path (string): path of the time series
+
+    Returns:
+        dict: values of each column in the order of the samples, by name
+    """
+    with open(series_path, "r") as seriesfh:
+        columns = seriesfh.readline().split()
+        values = np.loadtxt(seriesfh, delimiter="\t", ndmin=2).reshape(-1, len(columns))
+
+    return {column: values[:, i] for i, column in enumerate(columns)}
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Parameters of the simulation
+
+The physical parameters of a simulation are immutable objects owned
+by the Playground, the Population and the Cell instances, instead of
+class attributes shared by every instance, so more simulations can
+run in the same process. As they can't change, they are shared by
+reference and can be used as dictionary keys.
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18) Initial implementation
+"""
+
+import dataclasses
+import functools
+
+
+def parameter(name):
+    """Read-only property of a value of the parameters attribute"""
+    return property(lambda self: getattr(self.parameters, name))
+
+
+def _cast(parameters, cast, *names):
+    # values may come from string representations, e.g. Cell.fromstring
+    for name in names:
+        object.__setattr__(parameters, name, cast(float(getattr(parameters, name))))
+
+
+@dataclasses.dataclass(frozen=True)
+class CellParameters:
+    """CellParameters class
+
+    Parameters shared by the cells of a simulation.
+
+    Returns:
+        CellParameters: instance of a CellParameters
+    """
+    # $c_T$
+    threshold_concentration: float = 20.
+    # $\delta c$
+    delta_concentration: float = 6000.
+    # $\tau$
+    tau: float = 2.
+    # $t_R$
+    recovery_time: float = 20.
+    # lattice size / cell size factor
+    lattice_size_factor: int = 1
+
+    def __post_init__(self):
+        _cast(self, float, "threshold_concentration", "delta_concentration", "tau", "recovery_time")
+        _cast(self, int, "lattice_size_factor")
+
+    def asdict(self):
+        """Values by their names, keyword arguments of CellParameters and Population"""
+        return dataclasses.asdict(self)
+
+
+@dataclasses.dataclass(frozen=True)
+class PlaygroundParameters:
+    """PlaygroundParameters class
+
+    Parameters of a simulation, in the order of the arguments of
+    Playground and of its string representation.
+
+    Returns:
+        PlaygroundParameters: instance of a PlaygroundParameters
+    """
+    # cell specific parameters:
+    # $c_T$
+    cell_threshold_concentration: float = 20.
+    # $\delta c$
+    cell_delta_concentration: float = 6000.
+    # $\tau$
+    cell_tau: float = 2.
+    # $t_R$
+    cell_recovery_time: float = 20.
+
+    # environment specific parameters:
+    # a
+    lattice_size: float = 1.
+    # $\Gamma$
+    gamma: float = 0.01
+    # $\rho$
+    rho: float = 0.2
+    # mesh size
+    meshsize_x: int = 100
+    meshsize_y: int = 100
+
+    def __post_init__(self):
+        _cast(self, float, "cell_threshold_concentration", "cell_delta_concentration", "cell_tau",
+              "cell_recovery_time", "lattice_size", "gamma", "rho")
+        _cast(self, int, "meshsize_x", "meshsize_y")
+
+    @property
+    def lattice_size_factor(self):
+        """Number of lattice sites per cell in each direction"""
+        return int(1 / self.lattice_size)
+
+    @functools.cached_property
+    def cells(self):
+        """Parameters of the cells of the simulation, the same object on every access"""
+        return CellParameters(self.cell_threshold_concentration, self.cell_delta_concentration, self.cell_tau,
+                              self.cell_recovery_time, self.lattice_size_factor)
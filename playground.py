@@ -10,65 +10,119 @@ Authors:
     - Lenard Szantho <lenard@drenal.eu>
 
 Version:
+    - 0.12 (2026-10-18) Observables appended to a time series, snapshots are optional
+    - 0.11 (2026-10-18) Timers of the phases of the steps
+    - 0.10 (2026-10-18) Restart files continuing the simulation exactly
+    - 0.9 (2026-10-18) Cells are placed on distinct sites drawn at once by a numpy Generator
+    - 0.8 (2026-10-18) Tolerance of the sparse diffusion solver
+    - 0.7 (2026-10-18) Timestep can be set for implicit solvers, cells are updated in substeps
+    - 0.6 (2026-10-18) Independent replicas on stacked grids
+    - 0.5 (2026-10-18) Parameters are stored per instance in PlaygroundParameters
+    - 0.4 (2026-10-18) Cells are stored in a Population (structure of arrays),
+                       PDE is solved in place with double buffers
     - 0.3 (2020-11-07) New logic based on Kessler and Levine (1993) paper
     - 0.2 (2020-11-04) Bugfixes
     - 0.1 (2020-11-02) Initial implementation
 """
+import contextlib
+
 import numpy as np
 import matplotlib.pyplot as plt
 
 from multiprocessing import Pool
 
+import checkpoint
+import observables as observables_
+import restart
 from cell import Cell
+from diffusion import IMPLICIT_BACKENDS, make_solver
+from parameters import CellParameters, PlaygroundParameters, parameter
+from population import CELL_DTYPE, Population
+from timing import PhaseTimer
+from trajectory import TrajectoryWriter
+from writer import SnapshotWriter
 
 class Playground:
 
-    # cell specific global variables:
-    # $c_T$
-    cell_threshold_concentration = 20.
-    # $\delta c$
-    cell_delta_concentration = 6000.
-    # $\tau$
-    cell_tau = 2.
-    # $t_R$
-    cell_recovery_time = 20.
-
-    # environment specific global variables:
-    # a
-    lattice_size = 1.
-    # $\Gamma$
-    gamma = 0.5
-    # $\rho$
-    rho = 0.2
-    # mesh size
-    meshsize_x = 100
-    meshsize_y = 100
-    # mesh-lattice size factor
-    lattice_size_factor = 1    
+    # parameters of the simulation, see PlaygroundParameters
+    cell_threshold_concentration = parameter("cell_threshold_concentration")
+    cell_delta_concentration = parameter("cell_delta_concentration")
+    cell_tau = parameter("cell_tau")
+    cell_recovery_time = parameter("cell_recovery_time")
+    lattice_size = parameter("lattice_size")
+    gamma = parameter("gamma")
+    rho = parameter("rho")
+    meshsize_x = parameter("meshsize_x")
+    meshsize_y = parameter("meshsize_y")
+    lattice_size_factor = parameter("lattice_size_factor")
 
 
     def __init__(self, output, cell_threshold_concentration = 20., cell_delta_concentration = 6000., cell_tau = 2.,
-                 cell_recovery_time = 20., lattice_size = 1.0, gamma = 0.01, rho = 0.2, meshsize_x = 100, meshsize_y = 100):
-        Playground.cell_threshold_concentration = float(cell_threshold_concentration)
-        Playground.cell_delta_concentration = float(cell_delta_concentration)
-        Playground.cell_tau = float(cell_tau)
-        Playground.cell_recovery_time = float(cell_recovery_time)
-        Playground.lattice_size = float(lattice_size)
-        Playground.gamma = float(gamma)
-        Playground.rho = float(rho)
-        Playground.meshsize_x = int(float(meshsize_x))
-        Playground.meshsize_y = int(float(meshsize_y))
-        Playground.lattice_size_factor = int(1/Playground.lattice_size)
+                 cell_recovery_time = 20., lattice_size = 1.0, gamma = 0.01, rho = 0.2, meshsize_x = 100, meshsize_y = 100,
+                 backend = "numpy", debug = False, snapshot_format = "npz", precision = "float64", export_queue = 0,
+                 parameters = None, replicas = 1, seed = None, workers = None, dt = None, substeps = None,
+                 tolerance = None, restart_every = 0, timing = False, heartbeat = 0, observables = None,
+                 snapshots = True):
+        # the given PlaygroundParameters replace the individual values
+        if parameters is None:
+            parameters = PlaygroundParameters(cell_threshold_concentration, cell_delta_concentration, cell_tau,
+                                              cell_recovery_time, lattice_size, gamma, rho, meshsize_x, meshsize_y)
+        self.parameters = parameters
 
         self.output = output
+        # diffusion solver, see diffusion.BACKENDS
+        self.backend = backend
+        # number of threads of the parallel diffusion solvers, number of CPUs if None
+        self.workers = workers
+        # timestep of the diffusion, the stable timestep of the explicit scheme if None
+        self.requested_dt = None if dt is None else float(dt)
+        # cell updates per timestep, as many as fit into the timestep with the explicit timestep if None
+        self.substeps = None if substeps is None else int(substeps)
+        # concentration of the quiescent regions the sparse backend doesn't update, its default if None
+        self.tolerance = tolerance
+        # check the consistency of the occupancy lattice in every step
+        self.debug = debug
+        # format of the exported states, see checkpoint.FORMATS, or traj for a trajectory file
+        self.snapshot_format = snapshot_format
+        # float type of the exported cAMP concentration in binary format
+        self.precision = precision
+        # number of states waiting to be written in the background, 0 exports synchronously
+        self.export_queue = int(export_queue)
+        self.writer = None
+        # export the full states at the samples
+        self.snapshots = bool(snapshots)
+        # observables measured at the samples and appended to the time series of the replicas, see observables.py
+        self.observables = list(observables) if observables else []
+        self.series = None
+        # trajectory files of the replicas the states are appended to in traj format
+        self.trajectories = None
+        # number of independent simulations run side by side on stacked grids
+        self.replicas = int(replicas)
+        # seed of the random placement of the cells, replica r is seeded with seed + r,
+        # drawn from the global numpy generator if None
+        self.seed = seed
+        # steps between the restart files written during the simulation, 0 writes none
+        self.restart_every = int(restart_every)
+
+        # last completed step, steps between the exports and since the last one
+        self.step = 0
+        self.sampling = 10
+        self.phase = 0
+        # the next simulation continues after the step of an imported restart file, it starts from 0 otherwise
+        self.resumed = False
+
+        # steps between the timing reports printed during the simulation, 0 prints none
+        self.heartbeat = int(heartbeat)
+        # time spent in the phases of the steps, measured if enabled or reported periodically
+        self.timing = PhaseTimer(timing or self.heartbeat > 0)
 
         self.setupPlayground()
 
 
     @classmethod
-    def fromstring(cls, from_string):
+    def fromstring(cls, from_string, **kwargs):
         params = from_string.split()
-        return cls(*params)
+        return cls(*params, **kwargs)
 
 
     def setupPlayground(self):
@@ -80,43 +134,55 @@ class Playground:
         self.dy2 = self.lattice_size * self.lattice_size
         
         # lowering timestep by a factor of 1/2 to have it stable
-        self.dt = 0.5 * (0.5 * self.dx2 * self.dy2 / (self.lattice_size * self.lattice_size * (self.dx2 + self.dy2)))
+        self.explicit_dt = 0.5 * (0.5 * self.dx2 * self.dy2 / (self.lattice_size * self.lattice_size * (self.dx2 + self.dy2)))
+
+        # larger timesteps need an implicit solver, the cells are updated in substeps
+        self.dt = self.explicit_dt if self.requested_dt is None else self.requested_dt
+        if self.substeps is None:
+            self.substeps = max(1, int(round(self.dt / self.explicit_dt)))
+        self.cell_dt = self.dt / self.substeps
+
+        if self.dt > 2 * self.explicit_dt and self.backend not in IMPLICIT_BACKENDS:
+            print("WARNING: timestep {} is unstable with the {} backend, use one of {}".format(
+                self.dt, self.backend, ", ".join(sorted(IMPLICIT_BACKENDS))))
 
-        self.c0 = np.zeros((self.nx, self.ny))
-        self.c = self.c0.copy()
+        # grids of the replicas are stacked along the first axis
+        if self.replicas == 1:
+            self.shape = (self.nx, self.ny)
+        else:
+            self.shape = (self.replicas, self.nx, self.ny)
+
+        self.c0 = np.zeros(self.shape)
+        self.c = self.c0
 
         # setup cell layer
         number_of_cells = int(self.rho * self.meshsize_x * self.meshsize_y)
 
-        self.cells = []
-        coordinates_in_use = set()
-
-        # Create central beacon
-        cell = Cell(id=0, threshold_concentration=self.cell_threshold_concentration,
-                        delta_concentration = self.cell_delta_concentration, tau = self.cell_tau,
-                        recovery_time=self.cell_recovery_time, lattice_size_factor=self.lattice_size_factor)
-        cell.position = (int(self.nx / 2), int(self.ny / 2))
-        coordinates_in_use.add((int(self.nx / 2), int(self.ny / 2)))
-        cell.multiplier = 10
-        cell.activate()
-        cell.make_active_forever()
-        self.cells.append(cell)
-
-        for i in range(1,number_of_cells):
-            # generate unique coordinates for cell
-            while True:
-                x = np.random.randint(low=0, high=self.meshsize_x) * self.lattice_size_factor
-                y = np.random.randint(low=0, high=self.meshsize_y) * self.lattice_size_factor
-
-                if (x, y) not in coordinates_in_use:
-                    coordinates_in_use.add((x, y))
-                    break
-            
-            cell = Cell(id=i, threshold_concentration=self.cell_threshold_concentration,
-                        delta_concentration = self.cell_delta_concentration, tau = self.cell_tau,
-                        recovery_time = self.cell_recovery_time, lattice_size_factor=self.lattice_size_factor)
-            cell.position = (x,y)
-            self.cells.append(cell)
+        if self.replicas == 1:
+            self.cells = Population(number_of_cells, parameters=self.parameters.cells)
+        else:
+            self.cells = Population.batch(number_of_cells, self.replicas, parameters=self.parameters.cells)
+
+        # every replica has its own random stream, seeded from the global numpy generator if no seed is given
+        if self.seed is not None:
+            seeds = [int(self.seed) + r for r in range(self.replicas)]
+        else:
+            seeds = np.random.randint(2**31, size=self.replicas)
+        self.random = [np.random.default_rng(seed) for seed in seeds]
+
+        for replica, random in enumerate(self.random):
+            index = self.cells.members(replica)
+
+            # Create central beacon
+            cell = self.cells[index.start]
+            cell.position = (int(self.nx / 2), int(self.ny / 2))
+            cell.multiplier = 10
+            cell.activate()
+            cell.make_active_forever()
+
+            x, y = self.__place(random, number_of_cells - 1, cell.position)
+            self.cells.x[index.start + 1:index.stop] = x
+            self.cells.y[index.start + 1:index.stop] = y
 
         # ### ACTIVATE N CELLS RANDOMLY BEGINS
 
@@ -137,20 +203,50 @@ class Playground:
 
         # CREATE A RANDOM BEACON ENDS
 
-        # create and update sources
-        self.sources = np.zeros((self.nx, self.ny))
-        for cell in self.cells:
-            self.sources[cell.position] = cell.source
+        # lattice of the cell ids occupying each site, -1 if empty
+        self.occupancy = np.empty(self.shape, dtype=np.intp)
+        # create sources, the cells keep them up to date from now on
+        self.sources = np.zeros(self.shape)
+        self.cells.track(self.occupancy, self.sources)
 
-        # create shifted indices for vectorized PDE equation
-        self.rows_center = [[i] for i in range(0, self.c.shape[0])]
-        self.columns_from_left = [i for i in np.append(self.c.shape[1] - 1, range(0, self.c.shape[1] - 1))]
-        self.columns_from_right = [i for i in np.append(range(1, self.c.shape[1]), 0)]
+        # solver of the PDE equation and the buffer it writes the next state into
+        self.diffusion = make_solver(self.backend, self.c0.shape, self.dt, self.lattice_size, self.dx2, self.dy2, self.gamma,
+                                     self.workers, self.explicit_dt, self.tolerance)
+        self.c1 = np.empty_like(self.c0)
 
-        self.rows_from_above = [[i] for i in np.append(self.c.shape[0] - 1, range(0, self.c.shape[0] - 1))]
-        self.columns_center = [i for i in range(0, self.c.shape[1])]        
-        self.rows_from_below = [[i] for i in np.append(range(1, self.c.shape[0]), 0)]
 
+    def __place(self, random, count, beacon):
+        """Draw distinct random sites for the cells
+
+        Cells are placed on the sites of the cell sized grid, the site of
+        the beacon is excluded.
+
+        Args:
+            random (numpy.random.Generator): random stream of the replica
+            count (int): number of cells to place
+            beacon (tuple of ints): site of the beacon
+
+        Returns:
+            tuple of numpy arrays of ints: x- and y-coordinates of the cells
+        """
+        factor = self.lattice_size_factor
+        sites = self.meshsize_x * self.meshsize_y
+
+        # index of the beacon among the sites, if it is on one of them
+        beacon_x, beacon_y = beacon[0] // factor, beacon[1] // factor
+        taken = sites
+        if beacon[0] % factor == 0 and beacon[1] % factor == 0 and beacon_x < self.meshsize_x and beacon_y < self.meshsize_y:
+            taken = beacon_x * self.meshsize_y + beacon_y
+            sites -= 1
+
+        if count > sites:
+            raise ValueError("{} cells don't fit on {} free sites, rho is too large".format(count, sites))
+
+        # every site is drawn at most once, the ones after the beacon are shifted past it
+        index = random.choice(sites, size=count, replace=False)
+        index[index >= taken] += 1
+
+        return index // self.meshsize_y * factor, index % self.meshsize_y * factor
 
     # def __update_sources(self):
     #     self.sources.fill(0.)
@@ -162,91 +258,382 @@ class Playground:
     #         self.sources[cell.position] = cell.source
 
     def __timestep(self):
-        self.c = self.c0 + self.dt * (self.lattice_size * self.lattice_size * ( \
-            (self.c0[self.rows_center, self.columns_from_right] - 2 * self.c0 + self.c0[self.rows_center, self.columns_from_left]) / self.dx2 \
-            + (self.c0[self.rows_from_above, self.columns_center] - 2 * self.c0 + self.c0[self.rows_from_below, self.columns_center]) / self.dy2) \
-            - self.gamma * self.c0 + self.sources * self.dt)
-        
-        # concentration is strictly positive number
-        np.clip(self.c, 0, None, self.c)
-
-        self.c0 = self.c.copy()
-
-    def startSimulation(self, max_steps, sampling=10):
-        # export initial state
-        self.exportState("{}_{:04d}".format(self.output, 0))
+        self.diffusion.step(self.c0, self.c1, self.sources)
+
+        # swap the buffers, the new state becomes the current one
+        self.c0, self.c1 = self.c1, self.c0
+        self.c = self.c0
+
+    def __move_cells(self, state_1_cells):
+        """Move the cells towards the highest cAMP concentration around them
+
+        The result is the same as moving the cells one after the other in
+        the order of their ids to their best unoccupied neighbour site.
+        A cell can only be influenced by an earlier cell if their
+        neighbourhoods overlap, so only those cells are processed one by
+        one, all the other cells are moved at once.
+
+        Args:
+            state_1_cells (numpy array of ints): ids of the cells allowed to move, in increasing order
+        """
+        if len(state_1_cells) == 0:
+            return
+
+        candidates_x, candidates_y, worth = self.cells.propose_moves(state_1_cells, self.c)
+
+        sites = self.cells.site(state_1_cells, candidates_x, candidates_y)
+
+        # number of moving cells having each site in their neighbourhood
+        claims = np.zeros(self.c.shape, dtype=np.intp)
+        np.add.at(claims, sites, 1)
+        independent = np.all(claims[sites] == 1, axis=1)
+
+        free = worth[independent] & (self.occupancy[sites][independent] < 0)
+        can_move = np.any(free, axis=1)
+        best = np.argmax(free, axis=1)[can_move]
+        rows = np.flatnonzero(independent)[can_move]
+        if len(rows) > 0:
+            self.cells.move(state_1_cells[rows], candidates_x[rows, best], candidates_y[rows, best])
+
+        for row in np.flatnonzero(~independent):
+            cell = state_1_cells[row]
+            for x, y in zip(candidates_x[row, worth[row]], candidates_y[row, worth[row]]):
+                if self.occupancy[self.cells.site(cell, x, y)] < 0:
+                    self.cells.move(cell, x, y)
+                    break
 
-        # do one timestep to incorporate sources into the cAMP concentration
-        self.__timestep()
-        # export state after first step
-        self.exportState("{}_{:04d}".format(self.output, 1))
+    def checkOccupancy(self):
+        """Check that the occupancy and sources lattices agree with the cells
+
+        Returns:
+            bool: True if every cell is on its own site and the lattices are up to date
+        """
+        consistent = True
+
+        if np.count_nonzero(self.occupancy >= 0) != len(self.cells):
+            print("WARNING: cells with same coordinates, this should never happen!")
+            consistent = False
+
+        if not np.array_equal(self.occupancy[self.cells.site()], self.cells.id):
+            print("WARNING: occupancy lattice is out of sync with the cell positions!")
+            consistent = False
+
+        sources = np.zeros_like(self.sources)
+        sources[self.cells.site()] = self.cells.source
+        if not np.array_equal(sources, self.sources):
+            print("WARNING: sources are out of sync with the cells!")
+            consistent = False
+
+        return consistent
+
+    def startSimulation(self, max_steps, sampling=None):
+        # every state queued for export is written even if the simulation fails,
+        # the background writer is closed first, then the trajectories
+        with contextlib.ExitStack() as exports:
+            # the threads of the diffusion solver are stopped last
+            exports.callback(self.diffusion.close)
+            exports.callback(setattr, self, "series", None)
+            exports.callback(setattr, self, "trajectories", None)
+            exports.callback(setattr, self, "writer", None)
+
+            # the samples taken after the step a simulation is resumed from are taken again
+            until = self.step if self.resumed else None
+            if self.observables:
+                self.series = [exports.enter_context(observables_.TimeSeries(observables_.path(output),
+                                                                             self.observables, until))
+                               for output in self.outputs]
+            if self.snapshots and self.snapshot_format == "traj":
+                self.trajectories = [exports.enter_context(TrajectoryWriter("{}.traj".format(output), self.precision, until,
+                                                                            self.resumed))
+                                     for output in self.outputs]
+            if self.snapshots and self.export_queue > 0:
+                self.writer = exports.enter_context(SnapshotWriter(self.__write, self.export_queue))
+
+            if sampling is not None:
+                self.sampling = int(sampling)
+            self.__simulate(max_steps, self.sampling)
+
+    def __simulate(self, max_steps, sampling):
+        timing = self.timing
+        timing.start()
+
+        # a resumed simulation continues after its last step
+        if not self.resumed:
+            self.step = 0
+
+            # export initial state
+            self.__sample(0)
+
+            # do one timestep to incorporate sources into the cAMP concentration
+            with timing.phase("diffusion"):
+                self.__timestep()
+            # export state after first step
+            self.__sample(1)
+            self.phase = 0
 
         # start simulation
-        s0_sampling = 0
-        for s in range(1, max_steps+1):
-            self.__timestep()
-            s0_sampling += 1
-
-            if s0_sampling == sampling:
-                s0_sampling = 0
-                self.exportState("{}_{:04d}".format(self.output, s))
-
-            coordinates_in_use = set()
-            state_1_cells = []
-            for cell in self.cells:
-                if cell.position in coordinates_in_use:
-                    print("WARNING: cells with same coordinates, this should never happen!")
-
-                coordinates_in_use.add(cell.position)
-
-                cell.update(self.dt, self.c)
-
-                if cell.state == 1 and not cell.moved:
-                    state_1_cells.append(cell.id)
-
-            for cell_id in state_1_cells:
-                # move cells
-                for proposed_coord in self.cells[cell_id].propose_move(self.c):
-                    if not proposed_coord in coordinates_in_use:
-                        coordinates_in_use.remove(self.cells[cell_id].position)
-                        #self.sources[self.cells[cell_id].position] = 0.
-
-                        self.cells[cell_id].move(proposed_coord)
-
-                        coordinates_in_use.add(self.cells[cell_id].position)
-                        #self.sources[self.cells[cell_id].position] = self.cells[cell_id].source
-
-                        break
-
-            self.sources.fill(0.)
-            for cell in self.cells:
-                self.sources[cell.position] = cell.source
+        for s in range(self.step + 1, max_steps+1):
+            with timing.phase("diffusion"):
+                self.__timestep()
+            self.phase += 1
+
+            if self.phase == sampling:
+                self.phase = 0
+                self.__sample(s)
+
+            if self.debug:
+                with timing.phase("checks"):
+                    self.checkOccupancy()
+
+            for _ in range(self.substeps):
+                with timing.phase("cells"):
+                    self.cells.update(self.cell_dt, self.c)
+
+                with timing.phase("movement"):
+                    # cells always active can't move
+                    state_1_cells = np.flatnonzero((self.cells.state == 1) & ~self.cells.moved & ~self.cells.cancer)
+                    self.__move_cells(state_1_cells)
+
+            self.step = s
+            if self.restart_every > 0 and s % self.restart_every == 0:
+                with timing.phase("export"):
+                    self.exportRestart(restart.path(self.output))
+
+            timing.count(1, self.substeps * len(self.cells))
+            if self.heartbeat > 0 and s % self.heartbeat == 0:
+                print("step {}: {}".format(s, timing.report()))
+
+        self.resumed = False
+
+    def __sample(self, step):
+        if self.snapshots:
+            with self.timing.phase("export"):
+                self.exportStep(step)
+
+        if self.series is not None:
+            with self.timing.phase("observables"):
+                self.observeStep(step)
                      
 
-    def exportState(self, base_path):
-        with open("{}.cells".format(base_path), "w") as cellsfh:
-            for cell in self.cells:
-                cellsfh.write("{}\n".format(cell))
-        
-        with open("{}.playground".format(base_path), "w") as pgfh:
-            pgfh.write("{}\n".format(self))
+    @property
+    def outputs(self):
+        """Output bases of the replicas, numbered from 01 if there are more of them
+
+        Returns:
+            list of strings: output base of each replica
+        """
+        if self.replicas == 1:
+            return [self.output]
+
+        return ["{}{:02d}".format(self.output, r + 1) for r in range(self.replicas)]
+
+    def snapshot(self, replica=0):
+        """Copy the current state of a replica
+
+        Args:
+            replica (int): the replica
+
+        Returns:
+            checkpoint.Snapshot: state of the replica as a single simulation
+        """
+        if self.replicas == 1:
+            return checkpoint.Snapshot.frompopulation(str(self), self.c, self.cells)
+
+        return checkpoint.Snapshot.frompopulation(self.__describe(self.outputs[replica]), self.c[replica],
+                                                  self.cells, replica)
+
+    def exportStep(self, step):
+        """Export the current state as the given step of the simulation
+
+        The state of each replica is appended to its trajectory in traj
+        format, written into its output_[step] checkpoint otherwise. If a
+        background writer is running, it is only copied and queued for
+        writing.
+
+        Args:
+            step (int): step of the simulation
+        """
+        for replica in range(self.replicas):
+            snapshot = self.snapshot(replica)
+
+            if self.writer is not None:
+                self.writer.submit((replica, step), snapshot)
+            else:
+                self.__write((replica, step), snapshot)
+
+    def observeStep(self, step):
+        """Append the observables of the current state to the time series
+
+        Only possible during a simulation of a Playground with observables.
+
+        Args:
+            step (int): step of the simulation
+        """
+        for replica, series in enumerate(self.series):
+            c = self.c if self.replicas == 1 else self.c[replica]
+            index = self.cells.members(replica)
+            series.append(step, c, self.cells.x[index], self.cells.y[index], self.cells.state[index],
+                          self.parameters)
+
+    def __write(self, key, snapshot):
+        replica, step = key
+        if self.trajectories is not None:
+            self.trajectories[replica].append(step, snapshot)
+        else:
+            self.exportSnapshot("{}_{:04d}".format(self.outputs[replica], step), snapshot)
+
+    def exportState(self, base_path, replica=0):
+        """Write the current state into a checkpoint
+
+        Args:
+            base_path (string): path of the checkpoint without extension
+            replica (int): the replica to write
+        """
+        self.exportSnapshot(base_path, self.snapshot(replica))
+
+    def exportSnapshot(self, base_path, snapshot):
+        """Write a snapshot into a checkpoint
+
+        A single state is written as a binary checkpoint in traj format.
+
+        Args:
+            base_path (string): path of the checkpoint without extension
+            snapshot (checkpoint.Snapshot): state to write
+        """
+        snapshot_format = self.snapshot_format if self.snapshot_format in checkpoint.FORMATS else "npz"
+        checkpoint.write(base_path, snapshot, snapshot_format, self.precision)
+
+    def exportRestart(self, restart_path):
+        """Write the state needed to continue the simulation into a restart file
+
+        The states queued for export are written first, so the exports
+        up to the step of the restart file are complete.
+
+        Args:
+            restart_path (string): path of the restart file
+        """
+        if self.writer is not None:
+            self.writer.flush()
+
+        options = {name: getattr(self, name) for name in restart.OPTIONS}
+        options["dt"] = self.requested_dt
+        state = restart.Restart(str(self), self.c0, self.cells.torecords(), self.cells.parameters.asdict(),
+                                self.step, self.sampling, self.phase, options,
+                                [random.bit_generator.state for random in self.random])
+        restart.save(restart_path, state)
 
-        np.savetxt("{}.camp".format(base_path), self.c)
+    @classmethod
+    def fromrestart(cls, restart_path, **kwargs):
+        """Create a Playground continuing the simulation of a restart file
+
+        Args:
+            restart_path (string): path of the restart file
+            kwargs: keyword arguments of Playground not stored in the restart file, see restart.OPTIONS
+
+        Returns:
+            Playground: the simulation after the step of the restart file, startSimulation continues it
+        """
+        state = restart.load(restart_path)
+        playground = cls.fromstring(state.playground, **state.options, **kwargs)
+        playground.importRestart(state)
+        return playground
+
+    def importRestart(self, state):
+        """Continue the simulation from the state of a restart file
+
+        Args:
+            state (restart.Restart): state after the last completed step
+        """
+        if state.camp.shape != self.shape or len(state.cells) != len(self.cells):
+            raise ValueError("restart file doesn't fit the grid or the number of cells of the simulation")
+        if CellParameters(**state.cell_parameters) != self.cells.parameters:
+            raise ValueError("cell parameters of the restart file differ from the ones of the simulation")
+
+        for name in CELL_DTYPE.names:
+            getattr(self.cells, name)[:] = state.cells[name]
+        self.cells.reschedule()
+        self.cells.track(self.occupancy, self.sources)
+
+        self.c0 = state.camp.astype(np.float64)
+        self.c = self.c0
+        self.diffusion.reset()
+
+        for random, random_state in zip(self.random, state.random):
+            random.bit_generator.state = random_state
+
+        self.step = state.step
+        self.sampling = state.sampling
+        self.phase = state.phase
+        self.resumed = True
 
     def importCells(self, base_path):
-        del self.cells[:]
+        cells = []
 
         with open("{}.cells".format(base_path), "r") as cellsfh:
             for line in cellsfh:
                 cell = Cell.fromstring(line)
-                self.cells.append(cell)
+                cells.append(cell)
+
+        self.cells = Population.fromcells(cells)
+        self.cells.track(self.occupancy, self.sources)
 
     def importCAMP(self, base_path):
-        self.c = np.loadtxt("{}.camp".format(base_path))
-        self.c0 = self.c.copy()
+        self.c0 = np.loadtxt("{}.camp".format(base_path))
+        self.c = self.c0
+        self.diffusion.reset()
+
+    def importState(self, base_path):
+        """Import cells and cAMP concentration from a checkpoint of any format
+
+        Args:
+            base_path (string): path of the checkpoint without extension
+        """
+        self.importSnapshot(checkpoint.load(base_path))
+
+    def importSnapshot(self, snapshot, replica=None):
+        """Import cells and cAMP concentration from a checkpoint.Snapshot
+
+        Args:
+            snapshot (checkpoint.Snapshot): state to continue the simulation from
+            replica (int): the replica to import into, required if there are more of them
+        """
+        parameters = CellParameters(**snapshot.cell_parameters)
+        if parameters == self.parameters.cells:
+            parameters = self.parameters.cells
+
+        if self.replicas == 1:
+            self.cells = Population.fromrecords(snapshot.cells, parameters=parameters)
+            self.cells.track(self.occupancy, self.sources)
+
+            self.c0 = snapshot.camp.astype(np.float64)
+            self.c = self.c0
+            self.diffusion.reset()
+            return
+
+        # the replicas share the parameters and the arrays of the cells
+        if replica is None:
+            raise ValueError("the replica to import into is required with {} replicas".format(self.replicas))
+        if parameters != self.cells.parameters:
+            raise ValueError("cell parameters of the snapshot differ from the ones of the replicas")
+
+        index = self.cells.members(replica)
+        if len(snapshot.cells) != len(self.cells.id[index]) or snapshot.camp.shape != self.shape[1:]:
+            raise ValueError("snapshot doesn't fit the grid or the number of cells of the replicas")
+
+        for name in CELL_DTYPE.names:
+            getattr(self.cells, name)[index] = snapshot.cells[name]
+        self.cells.id[index] += index.start
+        self.cells.reschedule()
+        self.cells.track(self.occupancy, self.sources)
+
+        self.c0[replica] = snapshot.camp
+        self.diffusion.reset()
 
     def __str__(self):
-        return "{} {} {} {} {} {} {} {} {} {}".format(self.output, self.cell_threshold_concentration, self.cell_delta_concentration, self.cell_tau,
+        return self.__describe(self.output)
+
+    def __describe(self, output):
+        return "{} {} {} {} {} {} {} {} {} {}".format(output, self.cell_threshold_concentration, self.cell_delta_concentration, self.cell_tau,
                                              self.cell_recovery_time, self.lattice_size, self.gamma, self.rho, self.meshsize_x, self.meshsize_y)
 
 
@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Population class
+
+This class stores every cell of a simulation as a structure of
+arrays (one numpy array per Cell property) and advances the
+Kessler and Levine state machine of all cells at once.
+
+Single cells are still accessible as CellView objects, which
+behave like Cell instances but read and write the arrays of the
+population they belong to.
+
+The cells are not polled in every update: the expiry of the active and
+refactory periods is scheduled on a TimerWheel, and only the dormant
+cells on sites above the threshold concentration are excited.
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.5 (2026-10-18) Timer wheel of the state transitions, excitation through the occupancy lattice
+    - 0.4 (2026-10-18) Batched populations of independent replicas
+    - 0.3 (2026-10-18) Parameters are stored in CellParameters
+    - 0.2 (2026-10-18) Occupancy and sources lattice tracking
+    - 0.1 (2026-10-18) Initial implementation
+"""
+
+import numpy as np
+
+from cell import Cell
+from parameters import CellParameters, parameter
+
+
+# structured array type of a cell, fields in the same order as Cell.__str__
+CELL_DTYPE = np.dtype([
+    ("id", np.int64),
+    ("state", np.int8),
+    ("source", np.float64),
+    ("current_time", np.float64),
+    ("x", np.int64),
+    ("y", np.int64),
+    ("cancer", np.bool_),
+    ("multiplier", np.int64),
+    ("moved", np.bool_),
+])
+
+
+def periods(delta_t, duration):
+    """Number of updates after which a timer exceeds its duration
+
+    The time of a cell is advanced by repeated additions, the count
+    is computed the same way, so it is exactly the one of Cell.update.
+
+    Args:
+        delta_t (float): elapsed time of an update
+        duration (float): length of the period
+
+    Returns:
+        int: number of updates
+    """
+    if delta_t <= 0.:
+        raise ValueError("timestep has to be positive, not {}".format(delta_t))
+
+    time, count = 0., 0
+    while True:
+        time += delta_t
+        count += 1
+        if time > duration:
+            return count
+
+
+class TimerWheel:
+    """TimerWheel class
+
+    Schedule of the state transitions of the cells of a Population.
+    The updates are counted by the clock, a timer started at clock s
+    with a period of n updates expires at clock s + n. Timers are kept
+    in a ring of buckets, one for each of the next updates, so an
+    update only visits the cells whose timer expires.
+
+    The time of a cell is not stored, the one after k updates is read
+    from a table of the repeated sums of the timestep, so it's the
+    same as if it was advanced in every update. Cells that were timed
+    before the wheel was set up don't start from 0, they are polled
+    until their next transition.
+
+    Returns:
+        TimerWheel: instance of a TimerWheel
+    """
+
+    def __init__(self, size, delta_t, durations):
+        self.delta_t = delta_t
+        # number of updates of the period of each timed state
+        self.periods = {state: periods(delta_t, duration) for state, duration in durations.items()}
+
+        self.clock = 0
+        # clock the timer of each cell started at and the one it expires at, -1 if it has no timer
+        self.started = np.full(size, -1, dtype=np.int64)
+        self.expiry = np.full(size, -1, dtype=np.int64)
+        self.buckets = [[] for _ in range(max(self.periods.values()) + 1)]
+        # cells advanced one by one
+        self.polled = np.zeros(0, dtype=np.intp)
+        # time after a number of updates
+        self.elapsed = np.zeros(1)
+
+    def start(self, index, state):
+        """Start the timer of the selected cells
+
+        Args:
+            index (int, boolean mask or array of ints): cells that entered the state
+            state (int): the timed state
+        """
+        index = np.asarray(index)
+        index = np.flatnonzero(index) if index.dtype == bool else np.atleast_1d(index)
+        if len(self.polled):
+            self.polled = np.setdiff1d(self.polled, index, assume_unique=True)
+
+        expiry = self.clock + self.periods[state]
+        self.started[index] = self.clock
+        self.expiry[index] = expiry
+        self.buckets[expiry % len(self.buckets)].append(index)
+
+    def stop(self, index):
+        """Stop the timer of the selected cells"""
+        self.started[index] = -1
+        self.expiry[index] = -1
+
+    def advance(self):
+        """Count an update
+
+        Returns:
+            numpy array of ints: cells whose timer expired
+        """
+        self.clock += 1
+        bucket = self.buckets[self.clock % len(self.buckets)]
+        if not bucket:
+            return np.zeros(0, dtype=np.intp)
+
+        index = np.unique(np.concatenate(bucket))
+        bucket.clear()
+        # timers restarted since they were scheduled don't expire
+        return index[self.expiry[index] == self.clock]
+
+    def times(self):
+        """Time of the cells with a timer
+
+        Returns:
+            tuple of numpy arrays: the cells and their time
+        """
+        index = np.flatnonzero(self.started >= 0)
+        updates = self.clock - self.started[index]
+
+        if len(updates) and updates.max() >= len(self.elapsed):
+            steps = np.full(max(updates.max() + 1, 2 * len(self.elapsed)) - len(self.elapsed), self.delta_t)
+            steps[0] += self.elapsed[-1]
+            self.elapsed = np.concatenate([self.elapsed, np.add.accumulate(steps)])
+
+        return index, self.elapsed[updates]
+
+
+class Population:
+    """Population class
+
+    Holds the state, source, current_time, x, y, cancer, multiplier
+    and moved properties of all cells in numpy arrays. The index of
+    a cell in these arrays is the same as its id.
+
+    The current_time of the timed cells is computed from the timers
+    when it's read. After changing the state, current_time or cancer
+    arrays directly, reschedule() has to be called.
+
+    Returns:
+        Population: instance of a Population
+    """
+
+    # shared by all cells of the population, see CellParameters
+    threshold_concentration = parameter("threshold_concentration")
+    delta_concentration = parameter("delta_concentration")
+    tau = parameter("tau")
+    recovery_time = parameter("recovery_time")
+    lattice_size_factor = parameter("lattice_size_factor")
+
+    def __init__(self, size, threshold_concentration = 20,
+                 delta_concentration = 6000, tau = 2,
+                 recovery_time = 20, lattice_size_factor = 1,
+                 parameters = None):
+        if parameters is None:
+            parameters = CellParameters(threshold_concentration, delta_concentration, tau,
+                                        recovery_time, lattice_size_factor)
+        self.parameters = parameters
+
+        # schedule of the state transitions, set up by the first update
+        self.__timers = None
+        self.__synced = True
+
+        size = int(size)
+        self.id = np.arange(size)
+        self.state = np.zeros(size, dtype=np.int8)
+        self.source = np.zeros(size)
+        self.current_time = np.zeros(size)
+        self.x = np.zeros(size, dtype=np.intp)
+        self.y = np.zeros(size, dtype=np.intp)
+        self.cancer = np.zeros(size, dtype=bool)
+        self.multiplier = np.ones(size, dtype=np.int64)
+        self.moved = np.zeros(size, dtype=bool)
+
+        # replica of each cell in a batched population, None otherwise, see batch()
+        self.replica = None
+        self.replicas = 1
+
+        # lattice of the cell ids occupying each site, -1 if empty
+        self.occupancy = None
+        # lattice of the cAMP released on each site
+        self.sources = None
+
+    @property
+    def current_time(self):
+        """Time the cells spent in their current state"""
+        if not self.__synced:
+            index, times = self.__timers.times()
+            self.__current_time[index] = times
+            self.__synced = True
+        return self.__current_time
+
+    @current_time.setter
+    def current_time(self, values):
+        self.__current_time = values
+        self.__synced = True
+        self.reschedule()
+
+    def reschedule(self):
+        """Drop the schedule of the state transitions, the next update sets it up from the arrays"""
+        # the times are kept in the array
+        self.current_time
+        self.__timers = None
+
+    def __schedule(self, delta_t):
+        """Timer wheel of the given timestep, set up from the arrays if needed"""
+        if self.__timers is None or self.__timers.delta_t != delta_t:
+            self.reschedule()
+            self.__timers = TimerWheel(len(self), delta_t, {1: self.tau, 2: self.recovery_time})
+            self.__timers.polled = np.flatnonzero((self.state == 1) | (self.state == 2))
+        return self.__timers
+
+    @classmethod
+    def batch(cls, size, replicas, parameters=None):
+        """Create the cells of independent replicas of a simulation
+
+        The cells of every replica are stored in the same arrays, the
+        cells of replica r are the ones from r * size to (r + 1) * size.
+        The lattices of a batched population are stacked, the first index
+        of a site is the replica, see site().
+
+        Args:
+            size (int): number of cells of each replica
+            replicas (int): number of replicas
+            parameters (CellParameters): parameters shared by every cell
+
+        Returns:
+            Population: a Population holding the cells of every replica
+        """
+        population = cls(int(size) * int(replicas), parameters=parameters)
+        population.replica = np.repeat(np.arange(int(replicas), dtype=np.intp), int(size))
+        population.replicas = int(replicas)
+
+        return population
+
+    @classmethod
+    def fromcells(cls, cells):
+        """Create a Population out of a list of Cell objects
+
+        Args:
+            cells (list of Cell): cells ordered by their id
+
+        Returns:
+            Population: a Population holding the properties of the cells
+        """
+        if len(cells) > 0:
+            population = cls(len(cells), parameters=cells[0].parameters)
+        else:
+            population = cls(0)
+
+        for i, cell in enumerate(cells):
+            population.id[i] = cell.id
+            population.state[i] = cell.state
+            population.source[i] = cell.source
+            population.current_time[i] = cell.current_time
+            population.x[i] = cell.x
+            population.y[i] = cell.y
+            population.cancer[i] = cell.cancer
+            population.multiplier[i] = cell.multiplier
+            population.moved[i] = cell.moved
+
+        return population
+
+    @classmethod
+    def fromrecords(cls, records, **parameters):
+        """Create a Population out of a structured array
+
+        Args:
+            records (numpy array of CELL_DTYPE): properties of the cells ordered by their id
+            parameters: parameters shared by the cells, keyword arguments of __init__
+
+        Returns:
+            Population: a Population holding the properties of the cells
+        """
+        population = cls(len(records), **parameters)
+        for name in CELL_DTYPE.names:
+            getattr(population, name)[:] = records[name]
+
+        return population
+
+    def torecords(self, replica=None):
+        """Copy the properties of the cells into a structured array
+
+        Args:
+            replica (int): copy only the cells of this replica of a batched
+                population, their ids are counted from 0 in the replica
+
+        Returns:
+            numpy array of CELL_DTYPE: one record per cell
+        """
+        index = self.members(replica)
+
+        records = np.empty(len(self.id[index]), dtype=CELL_DTYPE)
+        for name in CELL_DTYPE.names:
+            records[name] = getattr(self, name)[index]
+        records["id"] -= index.start
+
+        return records
+
+    def members(self, replica=None):
+        """Cells of a replica of a batched population
+
+        Args:
+            replica (int): the replica, every cell if None
+
+        Returns:
+            slice: index of the cells in the arrays
+        """
+        if replica is None:
+            return slice(0, len(self))
+
+        size = len(self) // self.replicas
+        return slice(replica * size, (replica + 1) * size)
+
+    def site(self, index=slice(None), x=None, y=None):
+        """Lattice index of the selected cells
+
+        Args:
+            index (int, boolean mask, slice or array of ints): cells to locate
+            x (int or array of ints): x-coordinates to use instead of the cells' ones
+            y (int or array of ints): y-coordinates to use instead of the cells' ones,
+                coordinates may have more dimensions than the index, e.g. the
+                candidate sites of each cell
+
+        Returns:
+            tuple: x and y, prepended by the replica in a batched population
+        """
+        if x is None:
+            x, y = self.x[index], self.y[index]
+
+        if self.replica is None:
+            return x, y
+
+        replica = self.replica[index]
+        replica = np.reshape(replica, np.shape(replica) + (1,) * (np.ndim(x) - np.ndim(replica)))
+        return np.broadcast_to(replica, np.shape(x)), x, y
+
+    def update(self, delta_t, c):
+        """Update the state of every cell
+
+        Vectorized equivalent of calling Cell.update on each cell, but
+        only the cells changing their state are visited.
+
+        Args:
+            delta_t (float): elapsed time
+            c (numpy 2D array of floats): cAMP concentration matrix, stacked in a batched population
+        """
+        timers = self.__schedule(delta_t)
+        # the times of the cells with a timer are not up to date, they are not needed
+        current_time = self.__current_time
+
+        # cells timed since before the wheel was set up
+        polled = timers.polled
+        state = self.state[polled]
+        current_time[polled] += delta_t
+        deactivate = (state == 1) & (current_time[polled] > self.tau) & ~self.cancer[polled]
+        recover = (state == 2) & (current_time[polled] > self.recovery_time)
+        timers.polled = polled[~(deactivate | recover)]
+        deactivate, recover = polled[deactivate], polled[recover]
+
+        # cells whose timer expires, active cancer cells stay active
+        expired = timers.advance()
+        state = self.state[expired]
+        deactivate = np.concatenate([deactivate, expired[(state == 1) & ~self.cancer[expired]]])
+        recover = np.concatenate([recover, expired[state == 2]])
+        self.__synced = False
+
+        # end being active
+        self.state[deactivate] = 2
+        current_time[deactivate] = 0.
+        self.source[deactivate] = 0.
+        self.__write_sources(deactivate)
+        timers.start(deactivate, 2)
+
+        # dormant cells above threshold get excited, the ones recovering in this update are still refactory
+        self.activate(self.__triggered(c))
+
+        # end being refactory
+        self.state[recover] = 0
+        current_time[recover] = 0.
+        timers.stop(recover)
+
+    def __triggered(self, c):
+        """Dormant cells on sites above the threshold concentration"""
+        if self.occupancy is None or self.occupancy.shape != c.shape:
+            dormant = np.flatnonzero((self.state != 1) & (self.state != 2))
+            return dormant[c[self.site(dormant)] > self.threshold_concentration]
+
+        # only the sites above the threshold are looked up, the occupancy lattice tells their cells
+        index = self.occupancy.reshape(-1)[np.flatnonzero(c > self.threshold_concentration)]
+        index = index[index >= 0]
+        state = self.state[index]
+        return index[(state != 1) & (state != 2)]
+
+    def activate(self, index):
+        """Puts the selected cells in active state
+
+        Args:
+            index (int, boolean mask or array of ints): cells to activate
+        """
+        self.state[index] = 1
+        self.source[index] = self.multiplier[index] * self.delta_concentration / self.tau
+        self.__current_time[index] = 0.
+        self.moved[index] = False
+        self.__write_sources(index)
+        if self.__timers is not None:
+            self.__timers.start(index, 1)
+            self.__synced = False
+
+    def propose_moves(self, index, c):
+        """Propose moves based on cAMP concentration around the selected cells
+
+        Vectorized equivalent of calling Cell.propose_move on each cell.
+        The 3x3 neighbourhood of every cell is gathered at once and ordered
+        by decreasing concentration, equal concentrations keep the order in
+        which Cell.propose_move visits the neighbours.
+
+        Args:
+            index (array of ints): cells to propose moves for
+            c (numpy 2D array of floats): cAMP concentration matrix, stacked in a batched population
+
+        Returns:
+            tuple of three numpy 2D arrays: x- and y-coordinates of the
+                candidates, one row per cell, and a boolean mask telling
+                which candidates are worth moving to
+        """
+        neighbours = []
+        # x: coord=0, y: coord=1
+        for coord, position in enumerate([self.x[index], self.y[index]]):
+            lower = position - self.lattice_size_factor
+            upper = position + self.lattice_size_factor
+
+            # periodic boundary:
+            lower[lower < 0] = c.shape[coord - 2] - self.lattice_size_factor
+            upper[upper >= c.shape[coord - 2]] = 0
+
+            neighbours.append(np.stack([lower, position, upper], axis=1))
+
+        candidates_x = np.repeat(neighbours[0], 3, axis=1)
+        candidates_y = np.tile(neighbours[1], 3)
+        values = c[self.site(index, candidates_x, candidates_y)]
+
+        order = np.argsort(-values, axis=1, kind="stable")
+        candidates_x = np.take_along_axis(candidates_x, order, axis=1)
+        candidates_y = np.take_along_axis(candidates_y, order, axis=1)
+        values = np.take_along_axis(values, order, axis=1)
+
+        worth = (values - c[self.site(index)][:, np.newaxis]) > 5e-4
+
+        return candidates_x, candidates_y, worth
+
+    def track(self, occupancy, sources=None):
+        """Keep lattices up to date with the cell positions and sources
+
+        The lattices are filled with the current state of the cells and
+        they are updated incrementally by every later state change, place
+        or move call, instead of being rebuilt in every step.
+
+        Args:
+            occupancy (numpy 2D array of ints): lattice to write the cell ids into, stacked in a batched population
+            sources (numpy 2D array of floats): lattice to write the released cAMP into, stacked in a batched population
+        """
+        occupancy.fill(-1)
+        occupancy[self.site()] = self.id
+        self.occupancy = occupancy
+
+        if sources is not None:
+            sources.fill(0.)
+            sources[self.site()] = self.source
+        self.sources = sources
+
+    def place(self, index, x, y):
+        """Set the position of the selected cells
+
+        Args:
+            index (int or array of ints): cells to place
+            x (int or array of ints): new x-coordinates
+            y (int or array of ints): new y-coordinates
+        """
+        if self.occupancy is not None:
+            self.occupancy[self.site(index)] = -1
+        if self.sources is not None:
+            self.sources[self.site(index)] = 0.
+
+        self.x[index] = x
+        self.y[index] = y
+
+        if self.occupancy is not None:
+            self.occupancy[self.site(index)] = self.id[index]
+        self.__write_sources(index)
+
+    def __write_sources(self, index):
+        """Write the source of the selected cells into the tracked sources lattice"""
+        if self.sources is not None:
+            self.sources[self.site(index)] = self.source[index]
+
+    def move(self, index, x, y):
+        """Move the selected cells
+
+        Unlike Cell.move it doesn't check whether the cells are allowed
+        to move, that is the responsibility of the caller.
+
+        Args:
+            index (int or array of ints): cells to move
+            x (int or array of ints): new x-coordinates
+            y (int or array of ints): new y-coordinates
+        """
+        self.place(index, x, y)
+        self.moved[index] = True
+
+    def __len__(self):
+        return len(self.id)
+
+    def __getitem__(self, index):
+        return CellView(self, index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield CellView(self, i)
+
+
+def _column(name, cast, timed=False):
+    """Property reading and writing one element of a Population array, rescheduling the timers if timed"""
+    def getter(self):
+        return cast(getattr(self._population, name)[self._index])
+
+    def setter(self, value):
+        getattr(self._population, name)[self._index] = value
+        if timed:
+            self._population.reschedule()
+
+    return property(getter, setter)
+
+
+class CellView(Cell):
+    """Thin Cell view on one element of a Population
+
+    It has the same interface as Cell, but every property is stored
+    in the arrays of the population, so changes made through the view
+    are visible for the population and vice versa.
+
+    Returns:
+        CellView: view of a cell in the population
+    """
+    __slots__ = ("_population", "_index")
+
+    parameters = property(lambda self: self._population.parameters)
+
+    id = _column("id", int)
+    state = _column("state", int, timed=True)
+    current_time = _column("current_time", float, timed=True)
+    x = _column("x", int)
+    y = _column("y", int)
+    cancer = _column("cancer", bool, timed=True)
+    multiplier = _column("multiplier", int)
+    moved = _column("moved", bool)
+
+    def __init__(self, population, index):
+        self._population = population
+        self._index = int(index)
+
+    @property
+    def source(self):
+        return float(self._population.source[self._index])
+
+    @source.setter
+    def source(self, value):
+        self._population.source[self._index] = value
+        if self._population.sources is not None:
+            self._population.sources[self._population.site(self._index)] = value
+
+    @Cell.position.setter
+    def position(self, pos):
+        """Sets the position from a tuple, keeping the occupancy lattice up to date
+
+        Args:
+            pos (tuple of ints): x,y-coordinates
+        """
+        self._population.place(self._index, pos[0], pos[1])
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Restart files of the simulation
+
+A restart file holds everything a simulation needs to continue exactly
+where it stopped: the cAMP concentration and the cells of every
+replica, the last completed step, the phase of the sampling, the
+options defining the dynamics (timestep, substeps, tolerance, number of
+replicas, seed) and the state of the random generators. A resumed
+simulation reproduces the steps of an uninterrupted one bit for bit.
+
+Unlike the checkpoints, which are sampled states for the analysis, a
+restart file is overwritten by the next one. It is replaced atomically,
+so an interruption while writing leaves the previous one intact.
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18) Initial implementation
+"""
+
+import os
+import json
+
+import numpy as np
+
+
+VERSION = 1
+
+# options of the Playground stored in a restart file, they define the dynamics of the simulation
+OPTIONS = ["dt", "substeps", "tolerance", "replicas", "seed"]
+
+
+class Restart:
+    """Restart class
+
+    State of a simulation after a completed step.
+
+    Returns:
+        Restart: instance of a Restart
+    """
+
+    def __init__(self, playground, camp, cells, cell_parameters, step, sampling, phase, options, random):
+        # string representation of the Playground, input of Playground.fromstring
+        self.playground = playground
+        # cAMP concentration, stacked if there are more replicas
+        self.camp = camp
+        # structured array of population.CELL_DTYPE, the cells of every replica
+        self.cells = cells
+        # dict of checkpoint.CELL_PARAMETERS
+        self.cell_parameters = cell_parameters
+        # last completed step
+        self.step = int(step)
+        # sampling period of the exports and the steps since the last export
+        self.sampling = int(sampling)
+        self.phase = int(phase)
+        # dict of OPTIONS, keyword arguments of Playground
+        self.options = options
+        # state of the random generator of each replica
+        self.random = random
+
+
+def path(output):
+    """Path of the restart file of a simulation
+
+    Args:
+        output (string): output base of the simulation
+
+    Returns:
+        string: path of the restart file
+    """
+    return "{}.restart.npz".format(output)
+
+
+def save(restart_path, restart):
+    """Write a restart file, replacing the previous one atomically
+
+    Args:
+        restart_path (string): path of the restart file
+        restart (Restart): state to write
+    """
+    state = {
+        "version": VERSION,
+        "step": restart.step,
+        "sampling": restart.sampling,
+        "phase": restart.phase,
+        "options": restart.options,
+        "random": restart.random,
+        "cell_parameters": restart.cell_parameters,
+    }
+
+    with open("{}.tmp".format(restart_path), "wb") as restartfh:
+        np.savez(restartfh, camp=restart.camp, cells=restart.cells, playground=np.array(restart.playground),
+                 state=np.array(json.dumps(state)))
+        restartfh.flush()
+        os.fsync(restartfh.fileno())
+    os.replace("{}.tmp".format(restart_path), restart_path)
+
+
+def load(restart_path):
+    """Read a restart file
+
+    Args:
+        restart_path (string): path of the restart file
+
+    Returns:
+        Restart: the state stored in the file
+    """
+    with np.load(restart_path) as archive:
+        state = json.loads(str(archive["state"]))
+        if state["version"] != VERSION:
+            raise ValueError("{} has version {}, not {}".format(restart_path, state["version"], VERSION))
+
+        return Restart(str(archive["playground"]), archive["camp"], archive["cells"], state["cell_parameters"],
+                       state["step"], state["sampling"], state["phase"], state["options"], state["random"])
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Parameter sweep of the Dictyostelium simulation
+
+Runs every point of a parameter sweep on a pool of worker processes,
+each worker runs its simulations one after the other in the same
+interpreter. A point is skipped if it has already completed, so an
+interrupted sweep continues where it stopped when it's started again.
+The metrics of every completed run are gathered into summary.tsv.
+
+The sweep is described by a JSON file, e.g.:
+
+    {
+        "defaults": {"lattice": 1, "rho": 0.2, "threshold": 20, "camp": 6000, "tau": 2,
+                     "recovery": 20, "mesh": 100, "steps": 5000, "sampling": 100},
+        "grid": {"gamma": [0.1, 0.125, 0.15]},
+        "runs": [{"gamma": 0.115, "mesh": 400}],
+        "repeat": 1,
+        "seed": null,
+        "directory": "sim_{lattice}_{gamma}_{rho}_{threshold}_{camp}_{tau}_{recovery}",
+        "output": "simulation"
+    }
+
+Every combination of the grid and every entry of runs is a point, the
+parameters missing from them are taken from defaults, then from the
+defaults of dictyostelium.py. Parameters are named after the long
+options of dictyostelium.py (lattice, gamma, rho, threshold, camp, tau,
+recovery, mesh, steps, sampling, dt, substeps, tolerance, backend,
+format, precision, export_queue, observables), snapshots is false for
+--no-snapshots. Each point is run repeat times, the outputs of the
+repetitions are numbered (simulation01, simulation02, ...). The
+directory and output names are formatted with the parameters of the
+point. If seed is given, the run with index i is seeded with
+seed + i, otherwise every run gets a fresh seed.
+
+A run is complete when its [output].done file exists, it holds the
+parameters and metrics of the run as JSON.
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18) Initial implementation
+"""
+
+import os
+import csv
+import json
+import time
+import argparse
+import itertools
+
+import numpy as np
+
+import checkpoint
+import observables
+from diffusion import BACKENDS, process_pool
+from playground import Playground
+
+
+# parameters of a run and their defaults, same as the options of dictyostelium.py
+PARAMETERS = {
+    "lattice": 1.,
+    "gamma": 0.5,
+    "rho": 0.2,
+    "threshold": 20.,
+    "camp": 6000.,
+    "tau": 2.,
+    "recovery": 20.,
+    "mesh": 10.,
+    "steps": 100,
+    "sampling": 10,
+    "dt": None,
+    "substeps": None,
+    "tolerance": None,
+    "backend": "numpy",
+    "format": "npz",
+    "precision": "float64",
+    "export_queue": 0,
+    "observables": False,
+    "snapshots": True,
+}
+
+# keys of a sweep description
+SPEC_KEYS = ["defaults", "grid", "runs", "repeat", "seed", "directory", "output"]
+
+DIRECTORY = "sim_{lattice}_{gamma}_{rho}_{threshold}_{camp}_{tau}_{recovery}"
+OUTPUT = "simulation"
+
+# columns of the summary table after the parameters
+METRICS = ["seconds", "cells", "dormant", "active", "refactory", "camp_mean", "camp_max"]
+
+SUMMARY = "summary.tsv"
+
+
+class Run:
+    """Run class
+
+    One simulation of a sweep.
+
+    Returns:
+        Run: instance of a Run
+    """
+
+    def __init__(self, index, parameters, directory, output, seed=None):
+        # position of the run in the sweep
+        self.index = index
+        # dict of PARAMETERS
+        self.parameters = parameters
+        # directory of the run, relative to the directory of the sweep
+        self.directory = directory
+        # output base of the simulation inside the directory
+        self.output = output
+        self.seed = seed
+
+    def path(self, root):
+        """Output base path of the simulation
+
+        Args:
+            root (string): directory of the sweep
+
+        Returns:
+            string: path of the output base
+        """
+        return os.path.normpath(os.path.join(root, self.directory, self.output))
+
+    def done(self, root):
+        return os.path.isfile("{}.done".format(self.path(root)))
+
+    def __str__(self):
+        return os.path.normpath(os.path.join(self.directory, self.output))
+
+
+def check(parameters, source):
+    unknown = set(parameters) - set(PARAMETERS)
+    if unknown:
+        raise ValueError("unknown parameters in {}: {}".format(source, ", ".join(sorted(unknown))))
+
+
+def expand(spec):
+    """List the runs of a sweep
+
+    Args:
+        spec (dict): sweep description, see the module's documentation
+
+    Returns:
+        list of Run: runs in the order of the grid, then of the runs list
+    """
+    unknown = set(spec) - set(SPEC_KEYS)
+    if unknown:
+        raise ValueError("unknown keys in the sweep: {}".format(", ".join(sorted(unknown))))
+
+    defaults = dict(PARAMETERS)
+    check(spec.get("defaults", {}), "defaults")
+    defaults.update(spec.get("defaults", {}))
+
+    points = []
+    grid = spec.get("grid", {})
+    if grid:
+        check(grid, "grid")
+        names = list(grid)
+        for values in itertools.product(*[grid[name] for name in names]):
+            points.append(dict(zip(names, values)))
+
+    for point in spec.get("runs", []):
+        check(point, "runs")
+        points.append(point)
+
+    repeat = int(spec.get("repeat", 1))
+    seed = spec.get("seed")
+
+    runs = []
+    outputs = set()
+    for point in points:
+        parameters = dict(defaults)
+        parameters.update(point)
+
+        directory = spec.get("directory", DIRECTORY).format(**parameters)
+        output = spec.get("output", OUTPUT).format(**parameters)
+
+        for i in range(repeat):
+            run = Run(len(runs), parameters, directory,
+                      output if repeat == 1 else "{}{:02d}".format(output, i + 1),
+                      None if seed is None else int(seed) + len(runs))
+
+            if str(run) in outputs:
+                raise ValueError("more than one run writes into {}".format(run))
+            outputs.add(str(run))
+            runs.append(run)
+
+    return runs
+
+
+def metrics(pg, seconds):
+    """Summary metrics of a finished simulation
+
+    Args:
+        pg (Playground): the simulation
+        seconds (float): wall time of the simulation
+
+    Returns:
+        dict: value of each of METRICS
+    """
+    state = pg.cells.state
+    return {
+        "seconds": round(seconds, 3),
+        "cells": len(pg.cells),
+        "dormant": int(np.count_nonzero(state == 0)),
+        "active": int(np.count_nonzero(state == 1)),
+        "refactory": int(np.count_nonzero(state == 2)),
+        "camp_mean": float(np.mean(pg.c)),
+        "camp_max": float(np.max(pg.c)),
+    }
+
+
+def simulate(run, root):
+    """Run one simulation of a sweep and mark it as complete
+
+    Args:
+        run (Run): the run
+        root (string): directory of the sweep
+
+    Returns:
+        dict: parameters and metrics of the run, as written into the .done file
+    """
+    p = run.parameters
+    path = run.path(root)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    start = time.perf_counter()
+    pg = Playground(path, p["threshold"], p["camp"], p["tau"], p["recovery"], p["lattice"], p["gamma"], p["rho"],
+                    p["mesh"], p["mesh"], backend=p["backend"], snapshot_format=p["format"],
+                    precision=p["precision"], export_queue=p["export_queue"], dt=p["dt"], substeps=p["substeps"],
+                    tolerance=p["tolerance"], seed=run.seed,
+                    observables=observables.default() if p["observables"] else None, snapshots=p["snapshots"])
+    pg.startSimulation(max_steps=int(p["steps"]), sampling=int(p["sampling"]))
+
+    result = {"directory": run.directory, "output": run.output, "seed": run.seed}
+    result.update(p)
+    result.update(metrics(pg, time.perf_counter() - start))
+
+    # written last and atomically, its existence means the run is complete
+    with open("{}.done.tmp".format(path), "w") as donefh:
+        json.dump(result, donefh, indent=4)
+    os.replace("{}.done.tmp".format(path), "{}.done".format(path))
+
+    return result
+
+
+def _simulate(args):
+    run, root = args
+    try:
+        return run, simulate(run, root), None
+    except Exception as error:
+        return run, None, "{}: {}".format(type(error).__name__, error)
+
+
+def summarize(runs, root, output=SUMMARY):
+    """Write the parameters and metrics of the completed runs into a table
+
+    Args:
+        runs (list of Run): runs of the sweep
+        root (string): directory of the sweep
+        output (string): path of the tab separated table, relative to root
+
+    Returns:
+        int: number of rows written
+    """
+    columns = ["directory", "output", "seed"] + list(PARAMETERS) + METRICS
+
+    rows = []
+    for run in runs:
+        if run.done(root):
+            with open("{}.done".format(run.path(root)), "r") as donefh:
+                rows.append(json.load(donefh))
+
+    path = os.path.join(root, output)
+    with open("{}.tmp".format(path), "w", newline="") as tablefh:
+        table = csv.DictWriter(tablefh, fieldnames=columns, delimiter="\t", extrasaction="ignore")
+        table.writeheader()
+        table.writerows(rows)
+    os.replace("{}.tmp".format(path), path)
+
+    return len(rows)
+
+
+def sweep(spec, root=".", jobs=1):
+    """Run the incomplete runs of a sweep
+
+    Args:
+        spec (dict): sweep description, see the module's documentation
+        root (string): directory of the sweep
+        jobs (int): number of worker processes, runs are simulated in this process if 1
+
+    Returns:
+        list of Run: runs that failed
+    """
+    runs = expand(spec)
+    for run in runs:
+        if run.parameters["backend"] not in BACKENDS:
+            raise ValueError("unknown backend of {}: {}".format(run, run.parameters["backend"]))
+        if run.parameters["format"] not in checkpoint.FORMATS + ["traj"]:
+            raise ValueError("unknown format of {}: {}".format(run, run.parameters["format"]))
+
+    pending = [run for run in runs if not run.done(root)]
+    print("{} runs, {} already complete".format(len(runs), len(runs) - len(pending)))
+
+    failed = []
+    tasks = [(run, root) for run in pending]
+
+    pool = None
+    if jobs > 1 and len(pending) > 1:
+        pool = process_pool(jobs)
+    try:
+        results = pool.imap_unordered(_simulate, tasks) if pool is not None else map(_simulate, tasks)
+        for count, (run, result, error) in enumerate(results, 1):
+            if error is not None:
+                print("WARNING: {} failed: {}".format(run, error))
+                failed.append(run)
+            else:
+                print("[{}/{}] {} done in {:.1f}s".format(count, len(pending), run, result["seconds"]))
+            summarize(runs, root)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    summarize(runs, root)
+
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('spec', help="JSON description of the sweep")
+    parser.add_argument('-d', '--directory', help="Directory of the sweep (default: directory of the description)")
+    parser.add_argument('-j', '--jobs', help="Number of worker processes", default=os.cpu_count(), type=int)
+    parser.add_argument('-n', '--dry-run', help="List the runs and whether they are complete, without running them",
+                        action="store_true")
+    args = parser.parse_args()
+
+    with open(args.spec, "r") as specfh:
+        spec = json.load(specfh)
+
+    root = args.directory if args.directory is not None else os.path.dirname(args.spec) or "."
+
+    if args.dry_run:
+        for run in expand(spec):
+            print("{}\t{}".format("done" if run.done(root) else "todo", run))
+        return
+
+    failed = sweep(spec, root, args.jobs)
+    if failed:
+        raise SystemExit("{} runs failed".format(len(failed)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Unittest for the benchmark
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18)
+"""
+import unittest
+
+import benchmark
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_measure(self):
+        case = benchmark.cases([12], [0.3], [0.5], 4, "numpy")[0]
+        result = benchmark.measure(case)
+
+        for key in benchmark.KEYS:
+            self.assertEqual(result[key], case[key])
+        self.assertEqual(result["sites"], 24 * 24)
+        self.assertGreater(result["steps_per_second"], 0)
+        self.assertGreater(result["peak_rss_mb"], 0)
+        self.assertAlmostEqual(sum(result["phases"].values()), 1., places=6)
+
+    def test_exponents(self):
+        # seconds per step proportional to sites^1.5 for rho 0.2, a single mesh for rho 0.5
+        results = [dict(case, sites=mesh**2, steps_per_second=1e6 / mesh**3)
+                   for case, mesh in zip(benchmark.cases([50, 100, 200], [0.2], [1.], 10, "numpy"), [50, 100, 200])]
+        results.append(dict(benchmark.cases([50], [0.5], [1.], 10, "numpy")[0], sites=2500, steps_per_second=1.))
+
+        fits = benchmark.exponents(results)
+
+        self.assertEqual(list(fits), [(0.2, 1.)])
+        self.assertAlmostEqual(fits[(0.2, 1.)], 1.5)
+
+    def test_compare(self):
+        baseline = [dict(case, steps_per_second=100.) for case in benchmark.cases([50, 100], [0.2], [1.], 10, "numpy")]
+        results = [dict(case, steps_per_second=speed)
+                   for case, speed in zip(benchmark.cases([50, 100, 200], [0.2], [1.], 10, "numpy"), [95., 80., 1.])]
+
+        regressions = benchmark.compare(results, baseline, tolerance=0.1)
+
+        # mesh 200 isn't in the baseline
+        self.assertEqual(len(regressions), 1)
+        result, reference, change = regressions[0]
+        self.assertEqual(result["mesh"], 100)
+        self.assertAlmostEqual(change, -0.2)
+
+        self.assertEqual(benchmark.compare(results, baseline, tolerance=0.25), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
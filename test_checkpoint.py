@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Unittest for checkpoints
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18)
+"""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import checkpoint
+import playground
+import writer
+
+
+class CheckpointTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.base_path = os.path.join(self.tmpdir.name, "test")
+        np.random.seed(3)
+        self.playground = playground.Playground(os.path.join(self.tmpdir.name, "run"), gamma = 0.1, rho = 0.3, meshsize_x = 20, meshsize_y = 20)
+        self.playground.startSimulation(max_steps = 30, sampling = 1000)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def assertSnapshotEqual(self, first, second):
+        self.assertEqual(first.playground, second.playground)
+        self.assertEqual(first.cell_parameters, second.cell_parameters)
+        np.testing.assert_array_equal(first.camp, second.camp)
+        np.testing.assert_array_equal(first.cells, second.cells)
+
+    def test_roundtrip(self):
+        self.playground.exportState(self.base_path)
+        snapshot = checkpoint.load(self.base_path)
+
+        np.testing.assert_array_equal(snapshot.camp, self.playground.c)
+        np.testing.assert_array_equal(snapshot.cells, self.playground.cells.torecords())
+        self.assertEqual(snapshot.playground, str(self.playground))
+
+    def test_convert_text(self):
+        self.playground.snapshot_format = "text"
+        self.playground.exportState(self.base_path)
+        text = checkpoint.load(self.base_path)
+
+        checkpoint.convert(self.base_path, remove=True)
+        self.assertFalse(os.path.exists(self.base_path + ".camp"))
+        self.assertSnapshotEqual(checkpoint.load(self.base_path), text)
+
+    def test_find(self):
+        self.playground.exportState(self.base_path + "_0010")
+        self.playground.exportState(self.base_path + "_12000")
+        self.playground.snapshot_format = "text"
+        self.playground.exportState(self.base_path + "_0200")
+
+        self.assertEqual(checkpoint.find(self.base_path), [(10, self.base_path + "_0010"),
+                                                           (200, self.base_path + "_0200"), (12000, self.base_path + "_12000")])
+
+
+class SnapshotWriterTest(unittest.TestCase):
+    setUp = CheckpointTest.setUp
+    tearDown = CheckpointTest.tearDown
+
+    def test_background_export(self):
+        self.playground.export_queue = 1
+        self.playground.startSimulation(max_steps = 20, sampling = 5)
+
+        for step in [0, 1, 5, 10, 15, 20]:
+            self.assertTrue(checkpoint.exists(os.path.join(self.tmpdir.name, "run_{:04d}".format(step))))
+        np.testing.assert_array_equal(checkpoint.load(os.path.join(self.tmpdir.name, "run_0020")).camp,
+                                      self.playground.c)
+
+    def test_copy_on_submit(self):
+        with writer.SnapshotWriter(self.playground.exportSnapshot, queue_size=2) as snapshot_writer:
+            snapshot_writer.submit(self.base_path, checkpoint.Snapshot.frompopulation(str(self.playground),
+                                                                                      self.playground.c, self.playground.cells))
+            self.playground.c[:] = -1.
+            self.playground.cells.state[:] = 7
+
+        snapshot = checkpoint.load(self.base_path)
+        self.assertTrue(np.all(snapshot.camp >= 0.))
+        self.assertFalse(np.any(snapshot.cells["state"] == 7))
+
+    def test_error(self):
+        snapshot_writer = writer.SnapshotWriter(self.playground.exportSnapshot)
+        snapshot_writer.submit(os.path.join(self.tmpdir.name, "missing", "test"),
+                               checkpoint.Snapshot.frompopulation(str(self.playground), self.playground.c, self.playground.cells))
+        self.assertRaises(OSError, snapshot_writer.close)
+
+
+if __name__ == '__main__':
+    unittest.main()
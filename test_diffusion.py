@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Unittest for diffusion solvers
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18)
+"""
+import os
+import unittest
+
+import numpy as np
+
+import diffusion
+
+
+def reference_step(c0, sources, dt, lattice_size, gamma):
+    """The original fancy indexing implementation of Playground.__timestep"""
+    dx2 = dy2 = lattice_size * lattice_size
+    rows_center = [[i] for i in range(0, c0.shape[0])]
+    columns_from_left = [i for i in np.append(c0.shape[1] - 1, range(0, c0.shape[1] - 1))]
+    columns_from_right = [i for i in np.append(range(1, c0.shape[1]), 0)]
+    rows_from_above = [[i] for i in np.append(c0.shape[0] - 1, range(0, c0.shape[0] - 1))]
+    columns_center = [i for i in range(0, c0.shape[1])]
+    rows_from_below = [[i] for i in np.append(range(1, c0.shape[0]), 0)]
+
+    c = c0 + dt * (lattice_size * lattice_size * ( \
+        (c0[rows_center, columns_from_right] - 2 * c0 + c0[rows_center, columns_from_left]) / dx2 \
+        + (c0[rows_from_above, columns_center] - 2 * c0 + c0[rows_from_below, columns_center]) / dy2) \
+        - gamma * c0 + sources * dt)
+    np.clip(c, 0, None, c)
+    return c
+
+
+class FiniteDifferenceTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(7)
+        self.c0 = rng.uniform(0., 100., size=(24, 17))
+        self.sources = np.zeros_like(self.c0)
+        self.sources[rng.randint(0, 24, 30), rng.randint(0, 17, 30)] = 3000.
+        self.dt = 0.125
+
+    def test_matches_reference(self):
+        for lattice_size in [1., 0.5]:
+            solver = diffusion.FiniteDifference(self.c0.shape, self.dt, lattice_size,
+                                                lattice_size**2, lattice_size**2, 0.1)
+            c0 = self.c0.copy()
+            c = np.empty_like(c0)
+            expected = self.c0.copy()
+            for _ in range(20):
+                solver.step(c0, c, self.sources)
+                c0, c = c, c0
+                expected = reference_step(expected, self.sources, self.dt, lattice_size, 0.1)
+
+            np.testing.assert_array_equal(c0, expected)
+
+
+@unittest.skipIf(diffusion.numba is None, "numba is not installed")
+class NumbaFiniteDifferenceTest(unittest.TestCase):
+    setUp = FiniteDifferenceTest.setUp
+
+    def test_matches_numpy(self):
+        for lattice_size in [1., 0.5]:
+            args = (self.c0.shape, self.dt, lattice_size, lattice_size**2, lattice_size**2, 0.1)
+            solvers = [diffusion.FiniteDifference(*args), diffusion.NumbaFiniteDifference(*args)]
+            results = []
+            for solver in solvers:
+                c0 = self.c0.copy()
+                c = np.empty_like(c0)
+                for _ in range(20):
+                    solver.step(c0, c, self.sources)
+                    c0, c = c, c0
+                results.append(c0)
+
+            np.testing.assert_allclose(results[1], results[0], rtol=1e-12, atol=1e-12)
+
+
+class TiledFiniteDifferenceTest(unittest.TestCase):
+    setUp = FiniteDifferenceTest.setUp
+
+    def test_matches_numpy(self):
+        for c0 in [self.c0, np.stack([self.c0, self.c0[::-1]])]:
+            sources = np.broadcast_to(self.sources, c0.shape).copy()
+            expected = np.empty_like(c0)
+            diffusion.FiniteDifference(c0.shape, self.dt, 0.5, 0.25, 0.25, 0.1).step(c0, expected, sources)
+
+            # one row strips, uneven strips and a single strip
+            for workers in [24, 5, 1]:
+                solver = diffusion.TiledFiniteDifference(c0.shape, self.dt, 0.5, 0.25, 0.25, 0.1, workers)
+                self.assertEqual(len(solver.strips), workers)
+                c = np.empty_like(c0)
+                solver.step(c0, c, sources)
+                np.testing.assert_array_equal(c, expected)
+
+    def test_close(self):
+        solver = diffusion.TiledFiniteDifference(self.c0.shape, self.dt, 0.5, 0.25, 0.25, 0.1, 4)
+        c = np.empty_like(self.c0)
+        solver.step(self.c0, c, self.sources)
+        threads = solver.pool._threads
+
+        solver.close()
+        self.assertIsNone(solver.pool)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+
+        # the next step starts the threads again
+        again = np.empty_like(self.c0)
+        solver.step(self.c0, again, self.sources)
+        np.testing.assert_array_equal(again, c)
+        solver.close()
+
+
+class SourcesTest(unittest.TestCase):
+    """Gaussian peak with two sources on a non-square grid"""
+
+    def setUp(self):
+        x, y = np.meshgrid(np.arange(40), np.arange(30), indexing="ij")
+        self.c0 = 100. * np.exp(-((x - 20)**2 + (y - 15)**2) / 20.)
+        self.sources = np.zeros_like(self.c0)
+        self.sources[5, 5] = 3000.
+        self.sources[30, 20] = 30000.
+
+    def integrate(self, solver, steps):
+        c0 = self.c0.copy()
+        c = np.empty_like(c0)
+        for _ in range(steps):
+            solver.step(c0, c, self.sources)
+            c0, c = c, c0
+        return c0
+
+
+class AlternatingDirectionImplicitTest(SourcesTest):
+    def test_cyclic_tridiagonal(self):
+        n = 7
+        matrix = 3. * np.eye(n) - np.eye(n, k=1) - np.eye(n, k=-1) - np.eye(n, k=n - 1) - np.eye(n, k=1 - n)
+        d = np.random.RandomState(3).uniform(size=(n, 4))
+        x = diffusion.CyclicTridiagonal(n, 3., -1.).solve(d.copy())
+        np.testing.assert_allclose(matrix @ x, d, atol=1e-12)
+
+    def test_matches_explicit(self):
+        for lattice_size in [1., 0.5]:
+            dt = lattice_size**2 / 8
+            args = (self.c0.shape, dt, lattice_size, lattice_size**2, lattice_size**2, 0.05)
+            expected = self.integrate(diffusion.FiniteDifference(*args), 48)
+
+            # same timestep and 8 times larger one, the sources are scaled with the explicit timestep
+            for factor in [1, 8]:
+                solver = diffusion.AlternatingDirectionImplicit(args[0], dt * factor, *args[2:], source_dt=dt)
+                np.testing.assert_allclose(self.integrate(solver, 48 // factor), expected, rtol=0, atol=5e-3 * expected.max())
+
+    def test_stable(self):
+        solver = diffusion.AlternatingDirectionImplicit(self.c0.shape, 50., 1., 1., 1., 0.05, source_dt=0.125)
+        c = self.integrate(solver, 20)
+        self.assertTrue(np.all(np.isfinite(c)))
+        self.assertLess(c.max(), 2 * 30000. * 0.125 / 0.05)
+
+
+class SpectralTest(SourcesTest):
+    def test_matches_explicit(self):
+        dt = 0.125
+        args = (self.c0.shape, dt, 1., 1., 1., 0.05)
+        expected = self.integrate(diffusion.FiniteDifference(*args), 48)
+
+        # the modes are advanced exactly, the result doesn't depend on the timestep
+        results = [self.integrate(diffusion.Spectral(args[0], dt * factor, *args[2:], source_dt=dt), 48 // factor)
+                   for factor in [1, 8, 48]]
+        np.testing.assert_allclose(results[0], expected, rtol=0, atol=5e-3 * expected.max())
+        for result in results[1:]:
+            np.testing.assert_allclose(result, results[0], rtol=0, atol=1e-9 * expected.max())
+
+    def test_stable(self):
+        solver = diffusion.Spectral(self.c0.shape, 50., 1., 1., 1., 0.05, source_dt=0.125)
+        c = self.integrate(solver, 20)
+        self.assertTrue(np.all(np.isfinite(c)))
+        self.assertLess(c.max(), 2 * 30000. * 0.125 / 0.05)
+
+    def test_propagator_cached(self):
+        args = (self.c0.shape, 0.5, 1., 1., 1., 0.05)
+        self.assertIs(diffusion.Spectral(*args).decay, diffusion.Spectral(*args).decay)
+
+
+class SparseFiniteDifferenceTest(SourcesTest):
+    def compare(self, shape, tolerance):
+        sources = np.zeros(shape)
+        sources[..., 5, 5] = 3000.
+        expected = diffusion.FiniteDifference(shape, 0.125, 1., 1., 1., 0.1)
+        sparse = diffusion.SparseFiniteDifference(shape, 0.125, 1., 1., 1., 0.1, tolerance=tolerance, block=8)
+
+        c0, c = np.zeros(shape), np.empty(shape)
+        s0, s = np.zeros(shape), np.full(shape, np.nan)
+        # fraction of the blocks active in each step
+        active = []
+        for step in range(200):
+            # the sources are switched off, the wave decays
+            if step == 100:
+                sources[...] = 0.
+            expected.step(c0, c, sources)
+            sparse.step(s0, s, sources)
+            c0, c = c, c0
+            s0, s = s, s0
+            np.testing.assert_allclose(s0, c0, rtol=0, atol=10 * tolerance)
+            active.append(sparse.active.mean())
+
+        return active
+
+    def test_exact(self):
+        for shape in [(30, 21), (2, 20, 20)]:
+            self.compare(shape, 0.)
+
+    def test_tolerance(self):
+        active = self.compare((40, 40), 1e-3)
+        self.assertLess(min(active), 0.5)
+
+    def test_reset(self):
+        shape = self.c0.shape
+        solver = diffusion.SparseFiniteDifference(shape, 0.125, 1., 1., 1., 0.1, block=8)
+        c0, c = np.zeros(shape), np.empty(shape)
+        solver.step(c0, c, np.zeros(shape))
+
+        # the output is changed in place, the solver has to scan it again
+        c[...] = self.c0
+        solver.reset()
+        solver.step(c, c0, self.sources)
+
+        expected = np.empty(shape)
+        diffusion.FiniteDifference(shape, 0.125, 1., 1., 1., 0.1).step(self.c0, expected, self.sources)
+        np.testing.assert_allclose(c0, expected, rtol=0, atol=1e-5)
+
+
+class StackedTest(unittest.TestCase):
+    setUp = FiniteDifferenceTest.setUp
+
+    def test_replicas_independent(self):
+        backends = ["numpy", "spectral", "sparse"]
+        if diffusion.numba is not None:
+            backends.append("numba")
+        c0 = np.stack([self.c0, self.c0[::-1], 2 * self.c0])
+        sources = np.stack([self.sources, np.zeros_like(self.sources), self.sources[::-1]])
+
+        for backend in backends:
+            args = (self.c0.shape, self.dt, 1., 1., 1., 0.1)
+            single = diffusion.make_solver(backend, *args)
+            stacked = diffusion.make_solver(backend, c0.shape, *args[1:])
+
+            c = np.empty_like(c0)
+            stacked.step(c0, c, sources)
+            for r in range(len(c0)):
+                expected = np.empty_like(self.c0)
+                single.step(c0[r].copy(), expected, sources[r].copy())
+                np.testing.assert_array_equal(c[r], expected)
+
+
+class MakeSolverTest(unittest.TestCase):
+    def test_fallback(self):
+        numba = diffusion.numba
+        try:
+            diffusion.numba = None
+            solver = diffusion.make_solver("numba", (4, 4), 0.125, 1., 1., 1., 0.1)
+        finally:
+            diffusion.numba = numba
+
+        self.assertIs(type(solver), diffusion.FiniteDifference)
+
+    def test_incomplete_solver(self):
+        class Incomplete(diffusion.Solver):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete((4, 4), 0.125, 1., 1., 1., 0.1)
+
+
+class ProcessPoolTest(unittest.TestCase):
+    def test_spawned(self):
+        with diffusion.process_pool(1) as pool:
+            self.assertEqual(pool._ctx.get_start_method(), "spawn")
+            self.assertNotEqual(pool.apply(os.getpid), os.getpid())
+
+
+if __name__ == '__main__':
+    unittest.main()
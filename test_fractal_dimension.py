@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Unittest for the box counting of the fractal dimension
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18)
+"""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import diffusion
+import fractal_dimension
+import frames
+import playground
+
+
+def histogram_counts(cell_coords, meshsize_x, meshsize_y, scales):
+    """Box counts as fractal_dimension.plot used to count them"""
+    Ns = []
+    for scale in scales:
+        H, edges = np.histogramdd(cell_coords, bins=(np.arange(0, meshsize_x, scale), np.arange(0, meshsize_y, scale)))
+        Ns.append(int(np.sum(H > 0)))
+
+    return Ns
+
+
+class BoxCountingTest(unittest.TestCase):
+    def test_same_as_histogram(self):
+        random = np.random.default_rng(2)
+        for scales in [fractal_dimension.SCALES, [1, 2, 3, 7], [0.3, 1.5, 2.5, 9.99, 10, 12]]:
+            for meshsize_x, meshsize_y, factor, count in [(40, 30, 1, 300), (17, 23, 2, 200), (9, 9, 1, 0)]:
+                cell_coords = np.column_stack([random.integers(0, meshsize_x * factor, count),
+                                               random.integers(0, meshsize_y * factor, count)])
+                # on and beyond the last edges
+                cell_coords = np.vstack([cell_coords, [[0, 0], [meshsize_x - 1, meshsize_y - 1],
+                                                       [meshsize_x, meshsize_y], [meshsize_x, 0]]])
+
+                self.assertEqual(fractal_dimension.box_counts(cell_coords, meshsize_x, meshsize_y, scales),
+                                 histogram_counts(cell_coords, meshsize_x, meshsize_y, scales))
+
+        with self.assertRaises(ValueError):
+            fractal_dimension.box_counts([[0.5, 1.]], 10, 10)
+
+    def test_dimension(self):
+        # a filled square is two dimensional, the last edge at every scale is 64
+        x, y = np.meshgrid(np.arange(64), np.arange(64))
+        scales = [1, 2, 4, 8]
+        Ns = fractal_dimension.box_counts(np.column_stack([x.ravel(), y.ravel()]), 65, 65, scales)
+
+        self.assertAlmostEqual(fractal_dimension.dimension(scales, Ns), 2.)
+        self.assertTrue(np.isnan(fractal_dimension.dimension(scales, [0, 0, 0, 0])))
+
+    def test_frames(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "fractal")
+            pg = playground.Playground(output, gamma = 0.05, rho = 0.3, meshsize_x = 24, meshsize_y = 20, seed = 1,
+                                       replicas = 2, snapshot_format = "traj")
+            pg.startSimulation(max_steps = 40, sampling = 20)
+
+            frame_list = [frame for replica in pg.outputs for frame in frames.find(replica + ".traj")]
+            counts = fractal_dimension.frame_box_counts(frame_list, jobs = 2)
+
+            self.assertEqual(counts.shape, (8, len(fractal_dimension.SCALES)))
+            for frame, Ns in zip(frame_list, counts):
+                self.assertEqual(Ns.tolist(), histogram_counts(np.column_stack([frame.x, frame.y]), 24, 20,
+                                                               fractal_dimension.SCALES))
+            np.testing.assert_array_equal(fractal_dimension.frame_box_counts(frame_list), counts)
+
+    @unittest.skipIf(diffusion.numba is None, "numba is not installed")
+    def test_frames_after_numba(self):
+        # the threads of numba are running, the workers must not be forked from this process
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "numba")
+            pg = playground.Playground(output, gamma = 0.05, rho = 0.3, meshsize_x = 24, meshsize_y = 20, seed = 1,
+                                       backend = "numba", snapshot_format = "traj")
+            pg.startSimulation(max_steps = 20, sampling = 10)
+
+            frame_list = frames.find(output + ".traj")
+            np.testing.assert_array_equal(fractal_dimension.frame_box_counts(frame_list, jobs = 2),
+                                          fractal_dimension.frame_box_counts(frame_list))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Unittest for the lazy frame reader
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18)
+"""
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+import checkpoint
+import frames
+import playground
+import trajectory
+
+
+class FramesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmpdir.name, "test")
+        np.random.seed(9)
+        self.playground = playground.Playground(self.output, gamma = 0.1, rho = 0.3, meshsize_x = 20, meshsize_y = 25)
+        self.playground.startSimulation(max_steps = 20, sampling = 10)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_formats_agree(self):
+        cells = self.playground.cells
+        self.playground.snapshot_format = "text"
+        self.playground.exportState(self.output + "_text_0020")
+        self.playground.snapshot_format = "npz"
+        self.playground.exportState(self.output + "_binary_0020")
+        with trajectory.TrajectoryWriter(self.output + ".traj") as writer:
+            writer.append(20, checkpoint.Snapshot.frompopulation(str(self.playground), self.playground.c, cells))
+
+        for frame in [frames.load(self.output + "_text_0020"), frames.load(self.output + "_binary_0020.npz"),
+                      frames.find(self.output + ".traj")[-1]]:
+            np.testing.assert_array_equal(frame.x, cells.x)
+            np.testing.assert_array_equal(frame.y, cells.y)
+            np.testing.assert_array_equal(frame.state, cells.state)
+            np.testing.assert_array_equal(frame.camp, self.playground.c)
+            self.assertEqual(frame.meshsize, (20, 25))
+            self.assertEqual(frame.threshold_concentration, 20.)
+
+    def test_find(self):
+        self.assertEqual([frame.step for frame in frames.find(self.output)], [0, 1, 10, 20])
+        self.assertIsInstance(frames.find(self.output)[0], frames.BinaryFrame)
+
+    def test_pickle_trajectory_frame(self):
+        cells = self.playground.cells
+        with trajectory.TrajectoryWriter(self.output + ".traj") as writer:
+            writer.append(20, checkpoint.Snapshot.frompopulation(str(self.playground), self.playground.c, cells))
+
+        frame = pickle.loads(pickle.dumps(frames.find(self.output + ".traj")[0]))
+        self.assertEqual(frame.step, 20)
+        np.testing.assert_array_equal(frame.camp, self.playground.c)
+
+    def test_incomplete_frame(self):
+        class Incomplete(frames.Frame):
+            def column(self, name):
+                return np.zeros(0)
+
+        with self.assertRaises(TypeError):
+            Incomplete(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Unittest for the observables of the simulation
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18)
+"""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import checkpoint
+import fractal_dimension
+import observables
+import playground
+import restart
+
+
+def flood(x, y, shape, reach):
+    """Sizes of the groups of touching cells, found one cell after the other"""
+    cells = {(int(i), int(j)) for i, j in zip(x, y)}
+    sizes = []
+    while cells:
+        pending = [cells.pop()]
+        size = 0
+        while pending:
+            i, j = pending.pop()
+            size += 1
+            for dx in range(-reach, reach + 1):
+                for dy in range(-reach, reach + 1):
+                    neighbour = ((i + dx) % shape[0], (j + dy) % shape[1])
+                    if neighbour in cells:
+                        cells.remove(neighbour)
+                        pending.append(neighbour)
+        sizes.append(size)
+
+    return sorted(sizes)
+
+
+class ObservablesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmpdir.name, "observed")
+        self.arguments = dict(gamma = 0.05, rho = 0.3, meshsize_x = 24, meshsize_y = 20, seed = 3)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_label(self):
+        random = np.random.default_rng(1)
+        for shape, count, reach in [((30, 20), 150, 1), ((40, 40), 300, 2), ((10, 10), 0, 1)]:
+            site = random.choice(shape[0] * shape[1], count, replace=False)
+            x, y = np.unravel_index(site, shape)
+
+            labels = observables.label(x, y, shape, reach)
+
+            self.assertEqual(sorted(np.bincount(labels)[np.bincount(labels) > 0]), flood(x, y, shape, reach))
+            # the label of a group is its lowest index
+            np.testing.assert_array_equal(labels[labels], labels)
+            self.assertTrue(np.all(labels <= np.arange(count)))
+
+    def test_incomplete_observable(self):
+        class Incomplete(observables.Observable):
+            columns = ["nothing"]
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_series_match_snapshots(self):
+        pg = playground.Playground(self.output, observables = observables.default(), **self.arguments)
+        pg.startSimulation(max_steps = 60, sampling = 20)
+
+        series = observables.load(observables.path(self.output))
+        np.testing.assert_array_equal(series["step"], [0, 1, 20, 40, 60])
+
+        for row, step in enumerate(series["step"]):
+            snapshot = checkpoint.load("{}_{:04d}".format(self.output, int(step)))
+            cells = snapshot.cells
+            counts = [np.count_nonzero(cells["state"] == state) for state in range(3)]
+            boxes = fractal_dimension.box_counts(np.column_stack([cells["x"], cells["y"]]), 24, 20)
+            sizes = flood(cells["x"], cells["y"], snapshot.camp.shape, 1)
+
+            self.assertEqual([series[name][row] for name in ["dormant", "active", "refactory"]], counts)
+            self.assertAlmostEqual(series["camp_mean"][row], np.mean(snapshot.camp), delta=1e-9 * np.max(snapshot.camp))
+            self.assertAlmostEqual(series["camp_max"][row], np.max(snapshot.camp), delta=1e-9 * np.max(snapshot.camp))
+            self.assertEqual([series[column][row] for column in observables.BoxCounts().columns], boxes)
+            self.assertEqual(series["clusters"][row], sum(size >= 10 for size in sizes))
+            self.assertEqual(series["largest_cluster"][row], max(sizes))
+
+    def test_without_snapshots(self):
+        pg = playground.Playground(self.output, observables = [observables.StateCounts()], snapshots = False,
+                                   replicas = 2, timing = True, **self.arguments)
+        pg.startSimulation(max_steps = 30, sampling = 10)
+
+        self.assertEqual(checkpoint.find(self.output), [])
+        for replica, output in enumerate(pg.outputs):
+            series = observables.load(observables.path(output))
+            np.testing.assert_array_equal(series["step"], [0, 1, 10, 20, 30])
+            self.assertEqual(series["dormant"][-1] + series["active"][-1] + series["refactory"][-1],
+                             len(pg.cells) // 2)
+        self.assertGreater(pg.timing.phases["observables"].seconds, 0.)
+        self.assertEqual(pg.timing.phases["export"].seconds, 0.)
+
+    def test_resume(self):
+        full = playground.Playground(self.output + "_full", observables = observables.default(), snapshots = False,
+                                     **self.arguments)
+        full.startSimulation(max_steps = 100, sampling = 20)
+
+        interrupted = playground.Playground(self.output, observables = observables.default(), snapshots = False,
+                                            restart_every = 50, **self.arguments)
+        interrupted.startSimulation(max_steps = 70, sampling = 20)
+        resumed = playground.Playground.fromrestart(restart.path(self.output), observables = observables.default(),
+                                                    snapshots = False)
+        resumed.startSimulation(max_steps = 100)
+
+        with open(observables.path(self.output)) as resumedfh, open(observables.path(self.output + "_full")) as fullfh:
+            self.assertEqual(resumedfh.read(), fullfh.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
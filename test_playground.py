@@ -11,9 +11,17 @@ Authors:
 Version:
     - 0.1 (2020-11-02)
 """
-import playground
+import os
+import tempfile
 import unittest
 
+import numpy as np
+
+import checkpoint
+import playground
+import restart
+from trajectory import Trajectory
+
 class SingletonTest(unittest.TestCase):
     def setUp(self):
         self.playground = playground.Playground("test_playground", cell_threshold_concentration = 20., cell_delta_concentration = 6000., cell_tau = 2.,
@@ -30,6 +38,183 @@ class SingletonTest(unittest.TestCase):
         self.assertEqual(self.playground.meshsize_x, 100)
         self.assertEqual(self.playground.meshsize_y, 100)
 
+    def test_independent_instances(self):
+        other = playground.Playground("test_other", cell_threshold_concentration = 50., cell_tau = 5.,
+                 lattice_size = 0.5, gamma = 0.1, meshsize_x = 10, meshsize_y = 10)
+
+        self.assertEqual(self.playground.cell_threshold_concentration, 20.)
+        self.assertEqual(self.playground.gamma, 0.01)
+        self.assertEqual(self.playground.cells.tau, 2.)
+        self.assertEqual(self.playground.cells[1].lattice_size_factor, 1)
+        self.assertEqual(other.cell_threshold_concentration, 50.)
+        self.assertEqual(other.cells[1].tau, 5.)
+        self.assertEqual(other.cells.lattice_size_factor, 2)
+        self.assertIs(other.cells.parameters, other.parameters.cells)
+
+    def test_fromstring(self):
+        copy = playground.Playground.fromstring(str(self.playground))
+        self.assertEqual(copy.parameters, self.playground.parameters)
+        self.assertEqual(str(copy), str(self.playground))
+
+    def test_placement(self):
+        # every site of the cell sized grid is taken, the beacon's too
+        full = playground.Playground("test_full", rho = 1., lattice_size = 0.5, meshsize_x = 12, meshsize_y = 10, seed = 3)
+        self.assertTrue(full.checkOccupancy())
+        self.assertEqual(np.count_nonzero(full.occupancy >= 0), 120)
+        self.assertEqual(full.cells.state[0], 1)
+        self.assertTrue(np.all(full.cells.x % 2 == 0) and np.all(full.cells.y % 2 == 0))
+
+        same = playground.Playground("test_same", rho = 0.4, meshsize_x = 20, meshsize_y = 20, seed = 3)
+        again = playground.Playground("test_again", rho = 0.4, meshsize_x = 20, meshsize_y = 20, seed = 3)
+        other = playground.Playground("test_other", rho = 0.4, meshsize_x = 20, meshsize_y = 20, seed = 4)
+        np.testing.assert_array_equal(same.occupancy, again.occupancy)
+        self.assertFalse(np.array_equal(same.occupancy, other.occupancy))
+
+        with self.assertRaises(ValueError):
+            playground.Playground("test_crowded", rho = 1.1, meshsize_x = 10, meshsize_y = 10)
+
+
+class SimulationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmpdir.name, "test")
+        np.random.seed(1)
+        self.playground = playground.Playground(self.output, cell_threshold_concentration = 20., cell_delta_concentration = 6000.,
+                 cell_tau = 2., cell_recovery_time = 20., lattice_size = 1.0, gamma = 0.05, rho = 0.3, meshsize_x = 30, meshsize_y = 30)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_occupancy(self):
+        self.playground.startSimulation(max_steps = 200, sampling = 1000)
+
+        self.assertTrue(np.any(self.playground.cells.moved))
+        self.assertTrue(self.playground.checkOccupancy())
+
+        self.playground.cells[5].position = tuple(np.argwhere(self.playground.occupancy < 0)[0])
+        self.assertTrue(self.playground.checkOccupancy())
+
+        self.playground.cells.x[5] = self.playground.cells.x[6]
+        self.playground.cells.y[5] = self.playground.cells.y[6]
+        self.assertFalse(self.playground.checkOccupancy())
+
+    def test_substeps(self):
+        implicit = playground.Playground(self.output + "_adi", gamma = 0.05, rho = 0.3, meshsize_x = 30, meshsize_y = 30,
+                 backend = "adi", dt = 1., debug = True)
+        self.assertEqual(implicit.substeps, 8)
+        self.assertEqual(implicit.cell_dt, 0.125)
+
+        implicit.startSimulation(max_steps = 25, sampling = 1000)
+        self.assertTrue(implicit.checkOccupancy())
+        self.assertTrue(np.any(implicit.cells.moved))
+
+    def test_solver_closed(self):
+        tiled = playground.Playground(self.output + "_tiled", gamma = 0.05, rho = 0.3, meshsize_x = 30, meshsize_y = 30,
+                 backend = "tiled", workers = 3)
+        tiled.startSimulation(max_steps = 10, sampling = 1000)
+        self.assertIsNone(tiled.diffusion.pool)
+
+        tiled.startSimulation(max_steps = 10, sampling = 1000)
+        self.assertIsNone(tiled.diffusion.pool)
+
+    def test_timing(self):
+        timed = playground.Playground(self.output + "_timed", gamma = 0.05, rho = 0.3, meshsize_x = 30, meshsize_y = 30,
+                 timing = True, debug = True)
+        timed.startSimulation(max_steps = 20, sampling = 10)
+
+        summary = timed.timing.summary()
+        self.assertEqual(summary["steps"], 20)
+        self.assertEqual(timed.timing.cell_updates, 20 * len(timed.cells))
+        self.assertGreater(summary["phases"]["diffusion"]["seconds"], 0.)
+        self.assertGreater(summary["phases"]["checks"]["seconds"], 0.)
+        self.assertAlmostEqual(sum(phase["share"] for phase in summary["phases"].values()), 1.)
+
+        # disabled timers measure nothing
+        self.playground.startSimulation(max_steps = 20, sampling = 10)
+        self.assertEqual(self.playground.timing.phases["diffusion"].seconds, 0.)
+
+
+class ReplicasTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmpdir.name, "test")
+        self.arguments = dict(gamma = 0.05, rho = 0.3, meshsize_x = 30, meshsize_y = 20)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_replicas_match_single_runs(self):
+        ensemble = playground.Playground(self.output, replicas = 3, seed = 4, debug = True, **self.arguments)
+        ensemble.startSimulation(max_steps = 60, sampling = 30)
+        self.assertTrue(ensemble.checkOccupancy())
+        self.assertEqual(ensemble.c.shape, (3, 30, 20))
+
+        for r in range(3):
+            single = playground.Playground(self.output + "_single", seed = 4 + r, **self.arguments)
+            single.startSimulation(max_steps = 60, sampling = 30)
+            self.assertTrue(np.any(single.cells.moved))
+
+            for step in [0, 1, 30, 60]:
+                replica = checkpoint.load("{}{:02d}_{:04d}".format(self.output, r + 1, step))
+                expected = checkpoint.load("{}_single_{:04d}".format(self.output, step))
+                np.testing.assert_array_equal(replica.camp, expected.camp)
+                np.testing.assert_array_equal(replica.cells, expected.cells)
+                self.assertEqual(replica.playground.split()[1:], expected.playground.split()[1:])
+
+    def test_import_replica(self):
+        single = playground.Playground(self.output, seed = 2, **self.arguments)
+        single.startSimulation(max_steps = 10, sampling = 10)
+
+        ensemble = playground.Playground(self.output + "_ensemble", replicas = 2, seed = 5, **self.arguments)
+        ensemble.importSnapshot(single.snapshot(), replica = 1)
+        self.assertTrue(ensemble.checkOccupancy())
+        np.testing.assert_array_equal(ensemble.snapshot(1).cells, single.snapshot().cells)
+        np.testing.assert_array_equal(ensemble.c[1], single.c)
+
+        with self.assertRaises(ValueError):
+            ensemble.importSnapshot(single.snapshot())
+
+
+class RestartTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmpdir.name, "resumed")
+        self.full = os.path.join(self.tmpdir.name, "full")
+        self.arguments = dict(gamma = 0.05, rho = 0.3, meshsize_x = 24, meshsize_y = 20, seed = 6, restart_every = 40)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_resume_matches_uninterrupted(self):
+        for options in [dict(backend = "numpy"), dict(backend = "sparse", replicas = 2, snapshot_format = "traj")]:
+            uninterrupted = playground.Playground(self.full, **options, **self.arguments)
+            uninterrupted.startSimulation(max_steps = 250, sampling = 30)
+
+            # interrupted after step 190, continued from the restart file of step 160
+            interrupted = playground.Playground(self.output, **options, **self.arguments)
+            interrupted.startSimulation(max_steps = 190, sampling = 30)
+            options.pop("replicas", None)
+            resumed = playground.Playground.fromrestart(restart.path(self.output), **options)
+            self.assertEqual((resumed.step, resumed.phase, resumed.sampling), (160, 10, 30))
+            resumed.startSimulation(max_steps = 250)
+
+            np.testing.assert_array_equal(resumed.c, uninterrupted.c)
+            np.testing.assert_array_equal(resumed.cells.torecords(), uninterrupted.cells.torecords())
+            self.assertTrue(resumed.checkOccupancy())
+
+            if resumed.snapshot_format == "traj":
+                for replica, output in enumerate(resumed.outputs):
+                    states = Trajectory(output + ".traj")
+                    expected = Trajectory(uninterrupted.outputs[replica] + ".traj")
+                    np.testing.assert_array_equal(states.steps, expected.steps)
+                    np.testing.assert_array_equal(states.frames["camp"], expected.frames["camp"])
+            else:
+                self.assertEqual([step for step, _ in checkpoint.find(self.output)], [0, 1] + list(range(30, 251, 30)))
+                for step in [180, 240]:
+                    np.testing.assert_array_equal(checkpoint.load("{}_{:04d}".format(self.output, step)).cells,
+                                                  checkpoint.load("{}_{:04d}".format(self.full, step)).cells)
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Unittest for population
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18)
+"""
+import unittest
+
+import numpy as np
+
+from cell import Cell
+from population import Population, periods
+
+
+class PopulationTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(42)
+        self.c = rng.uniform(0., 40., size=(20, 20))
+
+        self.cells = []
+        for i, (x, y) in enumerate(zip(rng.randint(0, 20, 200), rng.randint(0, 20, 200))):
+            cell = Cell(i, x=x, y=y, state=rng.randint(0, 3), current_time=rng.uniform(0., 25.))
+            if cell.state == 1:
+                cell.source = cell.multiplier * cell.delta_concentration / cell.tau
+            self.cells.append(cell)
+        self.cells[0].multiplier = 10
+        self.cells[0].activate()
+        self.cells[0].make_active_forever()
+
+        self.population = Population.fromcells(self.cells)
+
+    def test_update_matches_cells(self):
+        for _ in range(30):
+            for cell in self.cells:
+                cell.update(0.125, self.c)
+            self.population.update(0.125, self.c)
+
+            self.assertEqual([str(cell) for cell in self.cells],
+                             [str(cell) for cell in self.population])
+
+    def test_timers_match_cells(self):
+        # cells on distinct sites, excited through the occupancy lattice
+        rng = np.random.RandomState(7)
+        sites = rng.permutation(400)[:150]
+        cells = [Cell(i, x=site // 20, y=site % 20, state=rng.randint(0, 3), current_time=rng.uniform(0., 25.))
+                 for i, site in enumerate(sites)]
+        cells[3].make_active_forever()
+        population = Population.fromcells(cells)
+        population.track(np.empty((20, 20), dtype=np.intp))
+
+        # longer than the refactory period, the timestep changes in between
+        for step in range(400):
+            c = rng.uniform(0., 21., size=(20, 20))
+            delta_t = 0.125 if step < 250 else 0.1
+            for cell in cells:
+                cell.update(delta_t, c)
+            population.update(delta_t, c)
+
+            if step % 50 == 0 or step == 399:
+                self.assertEqual([str(cell) for cell in cells], [str(cell) for cell in population])
+
+        # cells changed through the views are rescheduled
+        population[5].state = 1
+        population[5].current_time = 1.
+        cells[5].state = 1
+        cells[5].current_time = 1.
+        for _ in range(200):
+            cells[5].update(0.1, c)
+            population.update(0.1, c)
+        self.assertEqual(str(cells[5]), str(population[5]))
+
+    def test_periods(self):
+        self.assertEqual(periods(0.125, 2.), 17)
+        self.assertEqual(periods(0.1, 0.3), 3)
+
+    def test_propose_moves_matches_cells(self):
+        index = np.arange(len(self.cells))
+        candidates_x, candidates_y, worth = self.population.propose_moves(index, self.c)
+
+        for i, cell in enumerate(self.cells):
+            proposed = list(zip(candidates_x[i, worth[i]].tolist(), candidates_y[i, worth[i]].tolist()))
+            self.assertEqual(proposed, cell.propose_move(self.c))
+
+    def test_view_writes_through(self):
+        view = self.population[3]
+        view.position = (7, 8)
+        view.activate()
+
+        self.assertEqual((self.population.x[3], self.population.y[3]), (7, 8))
+        self.assertEqual(self.population.state[3], 1)
+        self.assertEqual(self.population.source[3], 3000.)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Unittest for the parameter sweep
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18)
+"""
+import os
+import csv
+import tempfile
+import unittest
+
+import sweep
+
+
+class SweepTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        self.spec = {
+            "defaults": {"gamma": 0.05, "rho": 0.3, "mesh": 12, "steps": 6, "sampling": 3},
+            "grid": {"gamma": [0.05, 0.1], "tau": [2, 3]},
+            "runs": [{"recovery": 10}],
+            "seed": 5,
+        }
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_expand(self):
+        runs = sweep.expand(self.spec)
+
+        self.assertEqual(len(runs), 5)
+        self.assertEqual(str(runs[0]), os.path.join("sim_1.0_0.05_0.3_20.0_6000.0_2_20.0", "simulation"))
+        self.assertEqual(runs[-1].parameters["recovery"], 10)
+        self.assertEqual([run.seed for run in runs], [5, 6, 7, 8, 9])
+
+        self.spec["repeat"] = 2
+        self.assertEqual(runs[0].output, "simulation")
+        self.assertEqual([run.output for run in sweep.expand(self.spec)][:2], ["simulation01", "simulation02"])
+
+        self.spec["directory"] = "."
+        with self.assertRaises(ValueError):
+            sweep.expand(self.spec)
+
+        with self.assertRaises(ValueError):
+            sweep.expand({"grid": {"gama": [0.1]}})
+
+    def test_resume(self):
+        runs = sweep.expand(self.spec)
+        self.assertEqual(sweep.sweep(self.spec, self.root, jobs=2), [])
+        for run in runs:
+            self.assertTrue(run.done(self.root))
+            self.assertTrue(os.path.isfile("{}_0006.npz".format(run.path(self.root))))
+
+        # an interrupted run is simulated again, completed ones are skipped
+        os.remove("{}.done".format(runs[1].path(self.root)))
+        mtime = os.path.getmtime("{}.done".format(runs[0].path(self.root)))
+        self.assertEqual(sweep.sweep(self.spec, self.root, jobs=1), [])
+        self.assertTrue(runs[1].done(self.root))
+        self.assertEqual(os.path.getmtime("{}.done".format(runs[0].path(self.root))), mtime)
+
+        with open(os.path.join(self.root, sweep.SUMMARY), "r") as tablefh:
+            rows = list(csv.DictReader(tablefh, delimiter="\t"))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(sorted(int(row["seed"]) for row in rows), [5, 6, 7, 8, 9])
+        self.assertEqual(rows[0]["cells"], "43")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Unittest for trajectory files
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18)
+"""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import checkpoint
+import playground
+import trajectory
+
+
+class TrajectoryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmpdir.name, "test")
+        np.random.seed(5)
+        self.playground = playground.Playground(self.output, gamma = 0.1, rho = 0.3, meshsize_x = 20, meshsize_y = 20,
+                                                snapshot_format = "traj")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_frames(self):
+        self.playground.startSimulation(max_steps = 30, sampling = 10)
+        states = trajectory.Trajectory(self.output + ".traj")
+
+        self.assertEqual(states.steps.tolist(), [0, 1, 10, 20, 30])
+        np.testing.assert_array_equal(states.at(30).camp, self.playground.c)
+        self.assertEqual(states[0].playground, str(self.playground))
+        self.assertEqual(len(states[0].cells), len(self.playground.cells))
+        self.assertRaises(KeyError, states.at, 5)
+
+    def test_append_and_truncated_frame(self):
+        self.playground.startSimulation(max_steps = 10, sampling = 10)
+        size = os.path.getsize(self.output + ".traj")
+        with open(self.output + ".traj", "ab") as trajfh:
+            trajfh.write(b"\0" * 100)
+        self.assertEqual(len(trajectory.Trajectory(self.output + ".traj")), 3)
+
+        snapshot = checkpoint.Snapshot.frompopulation(str(self.playground), self.playground.c, self.playground.cells)
+        with trajectory.TrajectoryWriter(self.output + ".traj") as writer:
+            writer.append(100, snapshot)
+
+        states = trajectory.Trajectory(self.output + ".traj")
+        self.assertEqual(states.steps.tolist(), [0, 1, 10, 100])
+        self.assertEqual(os.path.getsize(self.output + ".traj"), size + states.dtype.itemsize)
+        np.testing.assert_array_equal(states.at(100).cells, snapshot.cells)
+
+        with trajectory.TrajectoryWriter(self.output + ".traj", precision = "float32") as writer:
+            self.assertRaises(ValueError, writer.append, 101, snapshot)
+
+        other = playground.Playground(self.output, gamma = 0.5, rho = 0.3, meshsize_x = 20, meshsize_y = 20)
+        snapshot = checkpoint.Snapshot.frompopulation(str(other), other.c, other.cells)
+        with trajectory.TrajectoryWriter(self.output + ".traj") as writer:
+            self.assertRaises(ValueError, writer.append, 101, snapshot)
+
+    def test_new_simulation_replaces(self):
+        self.playground.startSimulation(max_steps = 30, sampling = 10)
+
+        other = playground.Playground(self.output, gamma = 0.5, rho = 0.3, meshsize_x = 20, meshsize_y = 20,
+                                      seed = 2, snapshot_format = "traj")
+        other.startSimulation(max_steps = 20, sampling = 10)
+
+        states = trajectory.Trajectory(self.output + ".traj")
+        self.assertEqual(states.steps.tolist(), [0, 1, 10, 20])
+        self.assertEqual(states.header["playground"], str(other))
+        np.testing.assert_array_equal(states.at(20).camp, other.c)
+
+
+if __name__ == '__main__':
+    unittest.main()
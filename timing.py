@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Timers of the phases of the simulation
+
+The Playground measures the time spent in each phase of a step
+(diffusion, cell update, movement, export, observables, debug checks)
+with a PhaseTimer. The report tells the steps and cell updates per
+second and the share of every phase, the time outside of the phases
+is reported as other. A disabled timer costs a method call per phase.
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.1 (2026-10-18) Initial implementation
+"""
+
+import json
+import time
+import contextlib
+
+
+# phases of a step, in the order they are reported
+PHASES = ["diffusion", "cells", "movement", "export", "observables", "checks"]
+
+
+class _Phase:
+    """Context manager adding the time spent in it to its phase"""
+
+    __slots__ = ("seconds", "started")
+
+    def __init__(self):
+        self.seconds = 0.
+        self.started = 0.
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.seconds += time.perf_counter() - self.started
+
+
+class PhaseTimer:
+    """PhaseTimer class
+
+    Accumulates the time spent in each phase and counts the steps and
+    cell updates, from start() on.
+
+    Returns:
+        PhaseTimer: instance of a PhaseTimer
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.phases = {name: _Phase() for name in PHASES}
+        self.disabled = contextlib.nullcontext()
+
+        self.started = None
+        self.steps = 0
+        self.cell_updates = 0
+
+    def start(self):
+        """Start the wall clock, if it isn't running yet"""
+        if self.started is None:
+            self.started = time.perf_counter()
+
+    def phase(self, name):
+        """Context manager timing a phase
+
+        Args:
+            name (string): one of PHASES
+        """
+        if not self.enabled:
+            return self.disabled
+        return self.phases[name]
+
+    def count(self, steps, cell_updates):
+        """Count completed steps
+
+        Args:
+            steps (int): number of steps
+            cell_updates (int): number of cell state updates in them
+        """
+        self.steps += steps
+        self.cell_updates += cell_updates
+
+    def summary(self):
+        """Throughput and time of the phases since start()
+
+        Returns:
+            dict: seconds, steps, steps_per_second, cell_updates_per_second,
+                and the seconds and share of each phase, other included
+        """
+        seconds = time.perf_counter() - self.started if self.started is not None else 0.
+        phases = {name: phase.seconds for name, phase in self.phases.items()}
+        phases["other"] = max(0., seconds - sum(phases.values()))
+
+        return {
+            "seconds": seconds,
+            "steps": self.steps,
+            "steps_per_second": self.steps / seconds if seconds > 0 else 0.,
+            "cell_updates_per_second": self.cell_updates / seconds if seconds > 0 else 0.,
+            "phases": {name: {"seconds": value, "share": value / seconds if seconds > 0 else 0.}
+                       for name, value in phases.items()},
+        }
+
+    def report(self):
+        """Human readable summary
+
+        Returns:
+            string: throughput on the first line, one line per phase
+        """
+        summary = self.summary()
+        lines = ["{} steps in {:.2f}s: {:.1f} steps/s, {:.3g} cell updates/s".format(
+            summary["steps"], summary["seconds"], summary["steps_per_second"], summary["cell_updates_per_second"])]
+        for name, phase in summary["phases"].items():
+            lines.append("    {:<11} {:9.3f}s {:6.1%}".format(name, phase["seconds"], phase["share"]))
+
+        return "\n".join(lines)
+
+    def save(self, path):
+        """Write the summary into a JSON file
+
+        Args:
+            path (string): path of the file
+        """
+        with open(path, "w") as timingfh:
+            json.dump(self.summary(), timingfh, indent=4)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Trajectory files of the simulation
+
+A trajectory stores every exported state of a simulation in one
+append-only file instead of one checkpoint per step. The file starts
+with a header (magic, length of the metadata, metadata as JSON) and
+continues with frames of fixed size: the step, the cAMP concentration
+and the cells as a structured array. As the frames have fixed size,
+the offset of every frame is known and the frames can be memory-mapped
+and accessed in any order.
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.3 (2026-10-18) Existing files are only appended to if asked, with the same parameters
+    - 0.2 (2026-10-18) Frames after a step can be dropped when appending
+    - 0.1 (2026-10-18) Initial implementation
+"""
+
+import os
+import json
+
+import numpy as np
+
+from checkpoint import Snapshot
+from population import CELL_DTYPE
+
+
+MAGIC = b"DICTYTRJ"
+VERSION = 1
+# frames start at a multiple of this many bytes
+ALIGNMENT = 64
+
+
+def frame_dtype(header):
+    """Structured type of one frame described by a trajectory header
+
+    Args:
+        header (dict): metadata of the trajectory
+
+    Returns:
+        numpy dtype: type of one frame
+    """
+    cells_dtype = np.dtype([tuple(field) for field in header["cells_dtype"]])
+
+    return np.dtype([
+        ("step", np.int64),
+        ("camp", np.dtype(header["camp_dtype"]), tuple(header["shape"])),
+        ("cells", cells_dtype, (header["cells"],)),
+    ])
+
+
+def read_header(path):
+    """Read the header of a trajectory file
+
+    Args:
+        path (string): path of the trajectory file
+
+    Returns:
+        tuple of dict and int: metadata and offset of the first frame
+    """
+    with open(path, "rb") as trajfh:
+        magic = trajfh.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError("{} is not a trajectory file".format(path))
+
+        length = int(np.frombuffer(trajfh.read(8), dtype="<u8")[0])
+        header = json.loads(trajfh.read(length).decode("utf-8"))
+
+    offset = len(MAGIC) + 8 + length
+    offset += -offset % ALIGNMENT
+
+    return header, offset
+
+
+class TrajectoryWriter:
+    """TrajectoryWriter class
+
+    Appends frames to a trajectory file, which is opened when the first
+    frame is appended. An existing file is replaced, unless append is
+    set. Then it has to have the same parameters of the simulation
+    (apart from the output name), grid, number of cells and precision,
+    and new frames are appended after the ones already in it. If until
+    is given, the frames of later steps are dropped first, e.g. when a
+    simulation is resumed from an earlier step.
+
+    Returns:
+        TrajectoryWriter: instance of a TrajectoryWriter
+    """
+
+    def __init__(self, path, precision="float64", until=None, append=True):
+        self.path = path
+        self.precision = precision
+        self.until = until
+        self.append_existing = append
+
+        self.trajfh = None
+
+    def __open(self, snapshot):
+        header = {
+            "version": VERSION,
+            "playground": snapshot.playground,
+            "cell_parameters": snapshot.cell_parameters,
+            "shape": list(snapshot.camp.shape),
+            "cells": len(snapshot.cells),
+            "camp_dtype": np.dtype(self.precision).str,
+            "cells_dtype": CELL_DTYPE.descr,
+        }
+
+        if self.append_existing and os.path.isfile(self.path) and os.path.getsize(self.path) > 0:
+            existing, offset = read_header(self.path)
+            if header["playground"].split()[1:] != existing["playground"].split()[1:]:
+                raise ValueError("can't append to {}, its playground is different".format(self.path))
+            for key in ["cell_parameters", "shape", "cells", "camp_dtype", "cells_dtype"]:
+                if json.loads(json.dumps(header[key])) != existing[key]:
+                    raise ValueError("can't append to {}, its {} is different".format(self.path, key))
+            self.header = existing
+            self.dtype = frame_dtype(existing)
+
+            # drop the incomplete frame of an interrupted write
+            frames = (os.path.getsize(self.path) - offset) // self.dtype.itemsize
+            if self.until is not None and frames > 0:
+                steps = np.memmap(self.path, dtype=self.dtype, mode="r", offset=offset, shape=(frames,))["step"]
+                later = np.flatnonzero(steps > self.until)
+                if len(later):
+                    frames = int(later[0])
+                del steps
+            self.trajfh = open(self.path, "r+b")
+            self.trajfh.truncate(offset + frames * self.dtype.itemsize)
+            self.trajfh.seek(0, os.SEEK_END)
+        else:
+            self.header = header
+            self.dtype = frame_dtype(header)
+
+            encoded = json.dumps(header).encode("utf-8")
+            self.trajfh = open(self.path, "wb")
+            self.trajfh.write(MAGIC)
+            self.trajfh.write(np.array(len(encoded), dtype="<u8").tobytes())
+            self.trajfh.write(encoded)
+            self.trajfh.write(b"\0" * (-self.trajfh.tell() % ALIGNMENT))
+
+        self.frame = np.zeros(1, dtype=self.dtype)
+
+    def append(self, step, snapshot):
+        """Append the state of a step as a new frame
+
+        Args:
+            step (int): step of the simulation
+            snapshot (checkpoint.Snapshot): state to append
+        """
+        if self.trajfh is None:
+            self.__open(snapshot)
+
+        self.frame["step"] = step
+        self.frame["camp"] = snapshot.camp
+        self.frame["cells"] = snapshot.cells
+
+        self.trajfh.write(self.frame.tobytes())
+        self.trajfh.flush()
+
+    def close(self):
+        if self.trajfh is not None:
+            self.trajfh.close()
+            self.trajfh = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class Trajectory:
+    """Trajectory class
+
+    Read-only, memory-mapped access to the frames of a trajectory file.
+    Frames are selected by their position with [] or by their step with
+    the at() method.
+
+    Returns:
+        Trajectory: instance of a Trajectory
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header, offset = read_header(path)
+        self.dtype = frame_dtype(self.header)
+
+        count = (os.path.getsize(path) - offset) // self.dtype.itemsize
+        if count > 0:
+            self.frames = np.memmap(path, dtype=self.dtype, mode="r", offset=offset, shape=(count,))
+        else:
+            self.frames = np.zeros(0, dtype=self.dtype)
+
+        # index of the frame of each step, the latest one if a step was written more than once
+        self.index = {int(step): i for i, step in enumerate(self.frames["step"])}
+
+    @property
+    def steps(self):
+        """Steps of the frames in the order they were written
+
+        Returns:
+            numpy array of ints: step of every frame
+        """
+        return np.asarray(self.frames["step"])
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, i):
+        """Frame at the given position
+
+        Args:
+            i (int): position of the frame, negative values count from the end
+
+        Returns:
+            checkpoint.Snapshot: state of the frame, its arrays are read-only memory-mapped views
+        """
+        return Snapshot(self.header["playground"], self.frames["camp"][i], self.frames["cells"][i],
+                        self.header["cell_parameters"])
+
+    def at(self, step):
+        """Frame of the given step
+
+        Args:
+            step (int): step of the simulation
+
+        Returns:
+            checkpoint.Snapshot: state of the frame
+        """
+        if step not in self.index:
+            raise KeyError("step {} is not in {}".format(step, self.path))
+
+        return self[self.index[step]]
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: set encoding=utf-8 :
+# vim: set fileencoding=utf-8 :
+"""
+Background writer of the simulation snapshots
+
+Snapshots are copied when they are submitted and written by a
+background thread, so the simulation doesn't have to wait for the
+formatting, compression and disk I/O. The queue of the writer is
+bounded, if it is full, submitting blocks until there is room again.
+
+Authors:
+    - Lenard Szantho <lenard@drenal.eu>
+
+Version:
+    - 0.2 (2026-10-18) Waiting for the queued snapshots
+    - 0.1 (2026-10-18) Initial implementation
+"""
+
+import queue
+import threading
+
+
+class SnapshotWriter:
+    """SnapshotWriter class
+
+    Writes checkpoint.Snapshot objects in a background thread with the
+    given function, called as write(key, snapshot) for every submitted
+    snapshot in the order of submission.
+    Use it as a context manager, or call close() when done, to be
+    sure every submitted snapshot is written.
+
+    Returns:
+        SnapshotWriter: instance of a SnapshotWriter
+    """
+
+    def __init__(self, write, queue_size=4):
+        self.write = write
+
+        self.queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        # first exception raised while writing, re-raised in the simulation's thread,
+        # nothing is written after it
+        self.error = None
+
+        self.thread = threading.Thread(target=self.__run, name="SnapshotWriter", daemon=True)
+        self.thread.start()
+
+    def __run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                break
+
+            key, snapshot = item
+            try:
+                if self.error is None:
+                    self.write(key, snapshot)
+            except Exception as error:
+                self.error = error
+            finally:
+                self.queue.task_done()
+
+    def submit(self, key, snapshot):
+        """Queue a snapshot for writing, blocks while the queue is full
+
+        Args:
+            key: first argument of the write function, e.g. a base path or a step
+            snapshot (checkpoint.Snapshot): state to write, must not be modified later
+        """
+        self.__raise()
+        self.queue.put((key, snapshot))
+
+    def flush(self):
+        """Wait until every queued snapshot is written"""
+        self.queue.join()
+        self.__raise()
+
+    def close(self):
+        """Write every queued snapshot and stop the background thread"""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+        self.__raise()
+
+    def __raise(self):
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # don't hide the original exception with a writing error
+            try:
+                self.close()
+            except Exception:
+                pass